@@ -41,6 +41,15 @@ WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 800
 FPS = 60
 
+# 地图外环化简（Douglas–Peucker）：低缩放时用化简后的都道府县外环绘制背景
+PREFECTURE_SIMPLIFY_TOL_KM = 0.2  # 容差（km），默认视图下远小于1像素
+PREFECTURE_LOD_ZOOM = 5.0  # zoom_level 超过该值时改用原始精度外环
+
+# 音频设置（需在 pygame.init() 之前 pre_init 才生效）
+# 缓冲区越小播报起音延迟越低，但在性能较弱的机器上可能出现爆音/断音
+AUDIO_FREQUENCY = 44100
+AUDIO_BUFFER_SIZE = 256
+
 # 地图范围 (日本)
 MAP_BOUNDS = {
     'min_lon': 122.0,
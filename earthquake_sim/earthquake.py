@@ -21,6 +21,22 @@ class Earthquake:
         self.depth = depth
         self.magnitude = magnitude
         self.time = 0  # 发震后经过的秒数
+        # 震级相关的包络参数缓存（震级会被EEW修正/按键调整，所以按震级值做键）
+        self._mag_terms_key = None
+        self._mag_terms = (0.0, 0.0)
+
+    def magnitude_terms(self) -> tuple[float, float]:
+        """返回 (mag_base, plateau)：S波持续时间的震级项与平台期长度 (秒)
+
+        mag_base = 4 * 2^(M-5)，plateau = 2 * 2^(M-6)；只在震级变化时重新计算。
+        """
+        if self._mag_terms_key != self.magnitude:
+            self._mag_terms_key = self.magnitude
+            self._mag_terms = (
+                4.0 * (2.0 ** (self.magnitude - 5.0)),
+                2.0 * (2.0 ** (self.magnitude - 6.0)),
+            )
+        return self._mag_terms
 
     def get_epicentral_distance(self, lat: float, lon: float) -> float:
         """计算震央距离 (km)"""
@@ -65,15 +81,21 @@ class Earthquake:
 
     def get_p_arrival_time(self, lat: float, lon: float) -> float:
         """计算P波到达时间 (秒)"""
-        epicentral = self.get_epicentral_distance(lat, lon)
-        hypo_dist = math.sqrt(epicentral**2 + self.depth**2)
-        # t = (hypo_dist - depth) / 6.5
-        return (hypo_dist - self.depth) / SCRATCH_P_SPEED
+        return self.p_arrival_time_at(self.get_epicentral_distance(lat, lon))
 
     def get_s_arrival_time(self, lat: float, lon: float) -> float:
         """计算S波到达时间 (秒)"""
-        epicentral = self.get_epicentral_distance(lat, lon)
-        hypo_dist = math.sqrt(epicentral**2 + self.depth**2)
+        return self.s_arrival_time_at(self.get_epicentral_distance(lat, lon))
+
+    def p_arrival_time_at(self, epicentral: float) -> float:
+        """已知震央距离 (km) 时的P波到达时间 (秒)，也接受numpy数组"""
+        hypo_dist = (epicentral**2 + self.depth**2) ** 0.5
+        # t = (hypo_dist - depth) / 6.5
+        return (hypo_dist - self.depth) / SCRATCH_P_SPEED
+
+    def s_arrival_time_at(self, epicentral: float) -> float:
+        """已知震央距离 (km) 时的S波到达时间 (秒)，也接受numpy数组"""
+        hypo_dist = (epicentral**2 + self.depth**2) ** 0.5
         # t = (hypo_dist - depth*4/6.5) / 4
         return (hypo_dist - self.depth * SCRATCH_S_SPEED / SCRATCH_P_SPEED) / SCRATCH_S_SPEED
 
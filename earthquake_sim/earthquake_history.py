@@ -3,20 +3,39 @@
 import math
 from typing import List, Tuple, Optional
 
+import numpy as np
+
 class EarthquakeHistory:
-    """地震履歴记录器 - 记录观测点数据用于事后分析"""
+    """地震履歴记录器 - 记录观测点数据用于事后分析
+
+    records 中每条为 (时刻, 类型码, 数据)：
+    - 类型码2（EEW）：数据为 "纬度,经度,深度,震级,报号" 字符串
+    - 类型码3（站点）：数据为 (变化位置, 新编码) 增量，变化位置为None时新编码是整帧；
+      导出时还原为 Scratch 格式的完整快照字符串
+    """
 
     def __init__(self):
-        self.records: List[Tuple[float, int, str]] = []  # [(时刻, 类型码, 数据), ...]
-        self.last_snapshot = ""  # 上次快照（避免重复记录）
+        # [(时刻, 类型码, 数据), ...]，格式见类说明
+        self.records: List[Tuple[float, int, object]] = []
+        self._prev_codes: Optional[np.ndarray] = None  # 上次快照的站点编码（避免重复记录）
+        self._max_code = -1  # 所有快照中的最大编码（用于总结报告）
         self.last_eew_revision = 0  # 上次EEW报号
 
     def clear(self):
         """清空历史记录"""
         self.records.clear()
-        self.last_snapshot = ""
+        self._prev_codes = None
+        self._max_code = -1
         self.last_eew_revision = 0
 
+    @staticmethod
+    def _encode_codes(codes: np.ndarray) -> str:
+        """站点编码数组 → Scratch格式的两位数字串"""
+        buf = np.empty(codes.size * 2, dtype=np.uint8)
+        buf[0::2] = codes // 10 + 0x30
+        buf[1::2] = codes % 10 + 0x30
+        return buf.tobytes().decode('ascii')
+
     def record_stations(self, time: float, stations: list):
         """记录站点数据（类型码3）
 
@@ -25,20 +44,25 @@ class EarthquakeHistory:
             stations: Station对象列表
         """
         # 压缩站点震度数据（Scratch格式）
-        compressed = ""
-        for station in stations:
-            # (震度 + 3) * 10，转为两位整数
-            value = int((station.intensity + 3) * 10)
-            # 限制在00-98之间
-            value = max(0, min(98, value))
-            compressed += f"{value:02d}"
-
-        # 检查是否与上次相同（避免重复记录）
-        if compressed != self.last_snapshot:
-            # 格式：floor(时刻) + 数据
-            record_data = f"{int(time)}{compressed}"
-            self.records.append((time, 3, record_data))
-            self.last_snapshot = compressed
+        # (震度 + 3) * 10，转为两位整数，限制在00-98之间
+        intensities = np.fromiter((station.intensity for station in stations), dtype=np.float64, count=len(stations))
+        codes = np.clip(((intensities + 3.0) * 10.0).astype(np.int32), 0, 98).astype(np.uint8)
+
+        prev = self._prev_codes
+        if prev is None or prev.shape != codes.shape:
+            # 首帧：保存整帧
+            record_data = (None, codes)
+        else:
+            # 之后只保存变化的站点（相邻快照通常只有少数站点变化）
+            changed = np.flatnonzero(codes != prev)
+            if changed.size == 0:
+                return  # 与上次相同，不重复记录
+            record_data = (changed, codes[changed])
+
+        self.records.append((time, 3, record_data))
+        self._prev_codes = codes
+        if codes.size:
+            self._max_code = max(self._max_code, int(record_data[1].max()))
 
     def record_eew(self, time: float, eew_info: dict, revision_count: int):
         """记录EEW信息（类型码2）
@@ -87,21 +111,10 @@ class EarthquakeHistory:
         eew_count = sum(1 for _, type_code, _ in self.records if type_code == 2)
         station_count = sum(1 for _, type_code, _ in self.records if type_code == 3)
 
-        # 计算最大震度（从站点记录中提取）
+        # 最大震度：记录时已在变化点维护了最大编码
         max_intensity = -3
-        for _, type_code, data in self.records:
-            if type_code == 3:  # 站点数据
-                # 跳过时间戳部分（前N位是时间戳）
-                intensity_data = data[10:]  # 假设时间戳10位
-                # 每两位表示一个站点震度
-                for i in range(0, len(intensity_data), 2):
-                    if i + 1 < len(intensity_data):
-                        try:
-                            value = int(intensity_data[i:i+2])
-                            intensity = value / 10.0 - 3.0
-                            max_intensity = max(max_intensity, intensity)
-                        except ValueError:
-                            continue
+        if self._max_code >= 0:
+            max_intensity = max(max_intensity, self._max_code / 10.0 - 3.0)
 
         return {
             'total_records': len(self.records),
@@ -111,6 +124,19 @@ class EarthquakeHistory:
             'station_records': station_count
         }
 
+    def _iter_export_lines(self):
+        """逐条生成导出行；站点记录从增量还原为完整快照（floor(时刻) + 数据）"""
+        state = None
+        for time, type_code, data in self.records:
+            if type_code == 3:
+                changed, codes = data
+                if changed is None:
+                    state = codes.copy()
+                else:
+                    state[changed] = codes
+                data = f"{int(time)}{self._encode_codes(state)}"
+            yield f"{time:.2f},{type_code},{data}\n"
+
     def export_to_file(self, filename: str):
         """导出历史记录到文件
 
@@ -118,13 +144,15 @@ class EarthquakeHistory:
             filename: 输出文件名
         """
         try:
+            # 先拼好整个文件内容，再一次性写入
+            header = (
+                "# 地震履歴记录\n"
+                f"# 总记录数: {len(self.records)}\n"
+                "# 格式: 时刻,类型码,数据\n\n"
+            )
+            body = "".join(self._iter_export_lines())
             with open(filename, 'w', encoding='utf-8') as f:
-                f.write("# 地震履歴记录\n")
-                f.write(f"# 总记录数: {len(self.records)}\n")
-                f.write("# 格式: 时刻,类型码,数据\n\n")
-
-                for time, type_code, data in self.records:
-                    f.write(f"{time:.2f},{type_code},{data}\n")
+                f.write(header + body)
 
             print(f"[履歴] 已导出 {len(self.records)} 条记录到 {filename}")
         except Exception as e:
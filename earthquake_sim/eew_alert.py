@@ -3,20 +3,17 @@
 import pygame
 from typing import Optional
 
+from text_cache import render_text
+
 class EEWAlert:
     """EEW警报框 UI"""
     def __init__(self, fonts=None):
-        # 字体 - 支持外部传入中文字体
-        if fonts:
-            self.large_font = fonts.get('large', pygame.font.Font(None, 48))
-            self.medium_font = fonts.get('medium', pygame.font.Font(None, 36))
-            self.small_font = fonts.get('small', pygame.font.Font(None, 28))
-            self.tiny_font = fonts.get('tiny', pygame.font.Font(None, 20))
-        else:
-            self.large_font = pygame.font.Font(None, 48)
-            self.medium_font = pygame.font.Font(None, 36)
-            self.small_font = pygame.font.Font(None, 28)
-            self.tiny_font = pygame.font.Font(None, 20)
+        # 字体 - 支持外部传入中文字体；只为未传入的字号创建默认字体
+        fonts = fonts or {}
+        self.large_font = fonts.get('large') or pygame.font.Font(None, 48)
+        self.medium_font = fonts.get('medium') or pygame.font.Font(None, 36)
+        self.small_font = fonts.get('small') or pygame.font.Font(None, 28)
+        self.tiny_font = fonts.get('tiny') or pygame.font.Font(None, 20)
 
         # 位置和大小 - 放在最大震度面板下方 (避免遮挡)
         self.x = 10
@@ -61,7 +58,7 @@ class EEWAlert:
 
         # 标题文字：緊急地震速報(警報)
         title_text = "緊急地震速報(警報)"
-        title_surface = self.small_font.render(title_text, True, (255, 255, 255))
+        title_surface = render_text(self.small_font, title_text, (255, 255, 255))
         screen.blit(title_surface, (self.x + 10, self.y + 5))
 
         # 震度和地名行
@@ -69,11 +66,11 @@ class EEWAlert:
 
         # 推定震度
         intensity_label = "推定"
-        intensity_label_surface = self.tiny_font.render(intensity_label, True, (200, 200, 200))
+        intensity_label_surface = render_text(self.tiny_font, intensity_label, (200, 200, 200))
         screen.blit(intensity_label_surface, (self.x + 10, self.y + 40))
 
         intensity_label2 = "震度"
-        intensity_label2_surface = self.tiny_font.render(intensity_label2, True, (200, 200, 200))
+        intensity_label2_surface = render_text(self.tiny_font, intensity_label2, (200, 200, 200))
         screen.blit(intensity_label2_surface, (self.x + 10, self.y + 60))
 
         # 震度数字（大号）
@@ -82,13 +79,13 @@ class EEWAlert:
 
         # 震度背景框
         pygame.draw.rect(screen, intensity_color, (self.x + 60, self.y + 35, 60, 70))
-        intensity_surface = self.large_font.render(intensity_text, True, (255, 255, 255))
+        intensity_surface = render_text(self.large_font, intensity_text, (255, 255, 255))
         intensity_rect = intensity_surface.get_rect(center=(self.x + 90, self.y + 70))
         screen.blit(intensity_surface, intensity_rect)
 
         # 震源地名（橙色背景）
         pygame.draw.rect(screen, (255, 140, 0), (self.x + 130, self.y + 45, 440, 50))
-        epicenter_surface = self.medium_font.render(epicenter_name, True, (255, 255, 255))
+        epicenter_surface = render_text(self.medium_font, epicenter_name, (255, 255, 255))
         screen.blit(epicenter_surface, (self.x + 140, self.y + 55))
 
         # M和深度行
@@ -96,23 +93,23 @@ class EEWAlert:
 
         # M8.1  200km
         mag_text = f"M{earthquake.magnitude:.1f}  {int(earthquake.depth)}km"
-        mag_surface = self.large_font.render(mag_text, True, (255, 255, 255))
+        mag_surface = render_text(self.large_font, mag_text, (255, 255, 255))
         screen.blit(mag_surface, (self.x + 10, mag_depth_y))
 
         # 推定长周期（如果有的话）
         if earthquake.magnitude >= 7.0:
             period_label = "推定"
-            period_label_surface = self.tiny_font.render(period_label, True, (200, 200, 200))
+            period_label_surface = render_text(self.tiny_font, period_label, (200, 200, 200))
             screen.blit(period_label_surface, (self.x + 10, mag_depth_y + 50))
 
             period_label2 = "長周期"
-            period_label2_surface = self.tiny_font.render(period_label2, True, (200, 200, 200))
+            period_label2_surface = render_text(self.tiny_font, period_label2, (200, 200, 200))
             screen.blit(period_label2_surface, (self.x + 10, mag_depth_y + 68))
 
             period_level = "4"  # 简化
             period_bg_rect = (self.x + 60, mag_depth_y + 50, 50, 40)
             pygame.draw.rect(screen, (150, 0, 150), period_bg_rect)
-            period_surface = self.medium_font.render(period_level, True, (255, 255, 255))
+            period_surface = render_text(self.medium_font, period_level, (255, 255, 255))
             period_rect = period_surface.get_rect(center=(self.x + 85, mag_depth_y + 70))
             screen.blit(period_surface, period_rect)
 
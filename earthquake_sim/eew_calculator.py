@@ -30,7 +30,10 @@ from __future__ import annotations
 import math
 from typing import Tuple
 
-from intensity import calc_jma_intensity
+import numpy as np
+
+from intensity import calc_jma_intensity, calc_jma_intensity_batch
+from projection import latlon_to_xy_km
 
 
 # Envelope parameters (seconds). Based on Japanese EEW observations.
@@ -43,7 +46,7 @@ def _clamp(x: float, lo: float, hi: float) -> float:
     return max(lo, min(hi, x))
 
 
-def _tau_s_decay(magnitude: float, distance_km: float, amp: float) -> float:
+def _tau_s_decay(magnitude: float, distance_km: float, amp: float, mag_base: float | None = None) -> float:
     """S-wave decay time constant (seconds), based on Japanese observational data.
 
     Improved scientific basis:
@@ -61,11 +64,14 @@ def _tau_s_decay(magnitude: float, distance_km: float, amp: float) -> float:
     - M6.0, 50km, rock → τS≈10s (D5-95≈35s)
     - M7.0, 100km, rock → τS≈18s (D5-95≈63s)
     - M8.0, 200km, rock → τS≈28s (D5-95≈98s)
+
+    mag_base may be passed in precomputed (see Earthquake.magnitude_terms()).
     """
     # Magnitude term based on Japanese observations
     # M5.0 → 4s, M6.0 → 8s, M7.0 → 16s, M8.0 → 32s (doubles per magnitude)
     # More realistic than 2.5× multiplier
-    mag_base = 4.0 * (2.0 ** (magnitude - 5.0))
+    if mag_base is None:
+        mag_base = 4.0 * (2.0 ** (magnitude - 5.0))
 
     # Distance term: Japanese formula uses R+10 to avoid singularity
     # R=10km → ×1.0, R=100km → ×1.15, R=300km → ×1.25
@@ -138,32 +144,40 @@ def _plateau_duration(magnitude: float) -> float:
     return 2.0 * (2.0 ** (magnitude - 6.0))
 
 
-def envelope_single(eq, lat: float, lon: float, amp: float = 1.0) -> Tuple[float, bool]:
-    """Instantaneous intensity at (lat, lon) for a single Earthquake eq.
-
-    Returns (intensity, is_s_wave_dominant).
+def envelope_single_core(
+    magnitude: float,
+    depth: float,
+    t: float,
+    t_p: float,
+    t_s: float,
+    epicentral_dist: float,
+    amp: float = 1.0,
+    mag_base: float | None = None,
+    plateau: float | None = None,
+) -> Tuple[float, bool]:
+    """Envelope math on plain scalars (no Earthquake lookups).
+
+    t is the time since origin; t_p / t_s are the P/S arrival times at the
+    site. mag_base / plateau are the per-source magnitude terms; they are
+    derived from magnitude when omitted. Returns (intensity, is_s_wave_dominant).
     """
     # Peak estimates
-    epicentral_dist = eq.get_epicentral_distance(lat, lon)
     bai = _bai_from_amp(amp)
-    i_s_peak = calc_jma_intensity(eq.magnitude, eq.depth, epicentral_dist, bai=bai)
+    i_s_peak = calc_jma_intensity(magnitude, depth, epicentral_dist, bai=bai)
     # P波峰值修正：基于日本观测，P波振幅约为S波的1/3-1/2
     # 对于JMA烈度，P波烈度通常比S波低1.0-2.0度
     i_p_peak = max(0.0, i_s_peak - 1.5)
 
-    # Arrival times and local time
-    t = getattr(eq, "time", 0.0)
-    t_p = eq.get_p_arrival_time(lat, lon)
-    t_s = eq.get_s_arrival_time(lat, lon)
     dt_p = t - t_p
     dt_s = t - t_s
 
     # Envelopes
     i_p_env = i_p_peak * _attack(dt_p, TAU_P_RISE) * _decay(dt_p, TAU_P_DECAY)
-    tau_s = _tau_s_decay(eq.magnitude, epicentral_dist, amp)
+    tau_s = _tau_s_decay(magnitude, epicentral_dist, amp, mag_base)
 
     # S波平台期机制: 强震动持续一段时间后才开始衰减
-    plateau = _plateau_duration(eq.magnitude)
+    if plateau is None:
+        plateau = _plateau_duration(magnitude)
     if dt_s <= 0.0:
         # S波未到达
         i_s_env = 0.0
@@ -182,6 +196,84 @@ def envelope_single(eq, lat: float, lon: float, amp: float = 1.0) -> Tuple[float
         return max(0.0, i_p_env), False
 
 
+def envelope_single(eq, lat: float, lon: float, amp: float = 1.0) -> Tuple[float, bool]:
+    """Instantaneous intensity at (lat, lon) for a single Earthquake eq.
+
+    Returns (intensity, is_s_wave_dominant).
+    """
+    # Epicentral distance is computed once and reused for both arrival times
+    epicentral_dist = eq.get_epicentral_distance(lat, lon)
+    mag_base, plateau = eq.magnitude_terms()
+    return envelope_single_core(
+        eq.magnitude,
+        eq.depth,
+        getattr(eq, "time", 0.0),
+        eq.p_arrival_time_at(epicentral_dist),
+        eq.s_arrival_time_at(epicentral_dist),
+        epicentral_dist,
+        amp,
+        mag_base,
+        plateau,
+    )
+
+
+def _site_factor_array(amp: np.ndarray) -> np.ndarray:
+    """Array form of the Vs30 site classification used in _tau_s_decay()."""
+    vs30 = 400.0 / np.maximum(amp, 0.1)
+    return np.where(vs30 >= 400.0, 1.0, np.where(vs30 >= 200.0, 1.3, 1.8))
+
+
+def envelope_vectorized(eq, x_km: np.ndarray, y_km: np.ndarray, amp: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """envelope_single() for many stations at once.
+
+    x_km / y_km are station positions already projected with
+    projection.latlons_to_xy_km(); amp is the per-station amplification.
+    Returns (intensities, is_s_wave_dominant) arrays aligned with the inputs.
+    """
+    magnitude = eq.magnitude
+    t = getattr(eq, "time", 0.0)
+
+    ex, ey = latlon_to_xy_km(eq.lat, eq.lon)
+    epicentral_dist = np.hypot(x_km - ex, y_km - ey)
+
+    # Peak estimates
+    bai = (amp * 4.0 + amp * amp) / 5.0
+    i_s_peak = calc_jma_intensity_batch(magnitude, eq.depth, epicentral_dist, bai=bai)
+    i_p_peak = np.maximum(0.0, i_s_peak - 1.5)
+
+    # Negative dt (wave not arrived) is clamped to 0, where attack() is 0 anyway
+    dt_p = np.maximum(t - eq.p_arrival_time_at(epicentral_dist), 0.0)
+    dt_s = np.maximum(t - eq.s_arrival_time_at(epicentral_dist), 0.0)
+
+    i_p_env = i_p_peak * (1.0 - np.exp(-dt_p / TAU_P_RISE)) * np.exp(-dt_p / TAU_P_DECAY)
+
+    mag_base, plateau = eq.magnitude_terms()
+    dist_factor = 1.0 + 0.1 * np.log10((epicentral_dist + 10.0) / 10.0)
+    tau_s = np.clip(mag_base * dist_factor * _site_factor_array(amp) / 3.5, 2.0, 40.0)
+
+    i_s_rise = i_s_peak * (1.0 - np.exp(-dt_s / TAU_S_RISE))
+    i_s_decay = i_s_peak * np.exp(-np.maximum(dt_s - plateau, 0.0) / tau_s)
+    i_s_env = np.where(dt_s <= plateau, i_s_rise, i_s_decay)
+
+    is_s = i_s_env >= i_p_env
+    intensities = np.maximum(0.0, np.where(is_s, i_s_env, i_p_env))
+    return intensities, is_s
+
+
+def envelope_multi_vectorized(manager, x_km: np.ndarray, y_km: np.ndarray, amp: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """envelope_multi() for many stations at once (see envelope_vectorized)."""
+    max_i = np.zeros_like(x_km, dtype=np.float64)
+    max_is_s = np.zeros(max_i.shape, dtype=bool)
+    for src in getattr(manager, "sources", []) or []:
+        if not getattr(src, "active", False):
+            continue
+        i_val, is_s = envelope_vectorized(src.eq, x_km, y_km, amp)
+        stronger = i_val > max_i
+        max_i = np.where(stronger, i_val, max_i)
+        max_is_s = np.where(stronger, is_s, max_is_s)
+    return max_i, max_is_s
+
+
 def envelope_multi(manager, lat: float, lon: float, amp: float = 1.0) -> Tuple[float, bool]:
     """Instantaneous intensity for MultiSourceManager.
 
@@ -10,10 +10,11 @@ Run this file to use the EEW-style diminishing intensity visualization:
 from __future__ import annotations
 
 import os
+import numpy as np
 import pygame
 
-from intensity import intensity_to_scale, get_intensity_color
-from eew_calculator import envelope_single, envelope_multi
+from intensity import get_intensity_color
+from eew_calculator import envelope_vectorized, envelope_multi_vectorized
 
 # Import the base simulator from the same directory
 from main import EarthquakeSimulator
@@ -39,23 +40,21 @@ class EEWEarthquakeSimulator(EarthquakeSimulator):
         if not self.earthquake:
             return
 
-        self.station_intensities = {}
         self.region_max_intensities = {}
         self.max_intensity = 0.0
         self.max_intensity_location = ""
 
-        for station in self.stations:
-            lat = float(station['lat'])
-            lon = float(station['lon'])
+        intensities, is_s_waves = envelope_vectorized(
+            self.earthquake, self.st_x_km, self.st_y_km, self.st_amp
+        )
+        # 只遍历达到可见阈值的站点
+        hit = np.flatnonzero(intensities >= 0.5)
+        self._set_station_hits(hit, intensities[hit], is_s_waves[hit])
+        for i in hit:
+            station = self.stations[i]
             area_code = station['area']['code']
             area_name = station['area']['name']
-            amp = float(station.get('amp', 1.0))
-
-            intensity, is_s_wave = envelope_single(self.earthquake, lat, lon, amp=amp)
-            if intensity < 0.5:
-                continue
-
-            self.station_intensities[(lat, lon)] = (intensity, is_s_wave)
+            intensity = float(intensities[i])
             prev = self.region_max_intensities.get(area_code, 0.0)
             if intensity > prev:
                 self.region_max_intensities[area_code] = intensity
@@ -73,34 +72,27 @@ class EEWEarthquakeSimulator(EarthquakeSimulator):
             self.intensity7_played = True
 
         # White circle alert when first reaching >= 3.0 (monotonic trigger)
-        for (lat, lon), (intensity, is_s_wave) in self.station_intensities.items():
-            if intensity >= 3.0 and intensity > self.max_triggered_intensity:
-                scale = intensity_to_scale(intensity)
-                self.max_triggered_intensity = intensity
-                self.alert_animations.append((lat, lon, self._current_time_value(), scale))
-                break
+        self._trigger_station_alert()
 
     def _calculate_station_intensities_multi_eew(self):
         if not self.multi_manager:
             return
 
-        self.station_intensities = {}
         self.region_max_intensities = {}
         self.max_intensity = 0.0
         self.max_intensity_location = ""
 
-        for station in self.stations:
-            lat = float(station['lat'])
-            lon = float(station['lon'])
+        intensities, is_s_waves = envelope_multi_vectorized(
+            self.multi_manager, self.st_x_km, self.st_y_km, self.st_amp
+        )
+        # 只遍历达到可见阈值的站点
+        hit = np.flatnonzero(intensities >= 0.5)
+        self._set_station_hits(hit, intensities[hit], is_s_waves[hit])
+        for i in hit:
+            station = self.stations[i]
             area_code = station['area']['code']
             area_name = station['area']['name']
-            amp = float(station.get('amp', 1.0))
-
-            intensity, is_s_wave = envelope_multi(self.multi_manager, lat, lon, amp=amp)
-            if intensity < 0.5:
-                continue
-
-            self.station_intensities[(lat, lon)] = (intensity, is_s_wave)
+            intensity = float(intensities[i])
             prev = self.region_max_intensities.get(area_code, 0.0)
             if intensity > prev:
                 self.region_max_intensities[area_code] = intensity
@@ -116,12 +108,7 @@ class EEWEarthquakeSimulator(EarthquakeSimulator):
             self.intensity7_sound.play()
             self.intensity7_played = True
 
-        for (lat, lon), (intensity, is_s_wave) in self.station_intensities.items():
-            if intensity >= 3.0 and intensity > self.max_triggered_intensity:
-                scale = intensity_to_scale(intensity)
-                self.max_triggered_intensity = intensity
-                self.alert_animations.append((lat, lon, self._current_time_value(), scale))
-                break
+        self._trigger_station_alert()
 
 
 if __name__ == "__main__":
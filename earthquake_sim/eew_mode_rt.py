@@ -10,12 +10,13 @@ from __future__ import annotations
 
 import os
 import math
+import numpy as np
 import pygame
 
 from intensity import intensity_to_scale
 import eew_calculator as eew
-from eew_calculator import envelope_single, envelope_multi
-from main import EarthquakeSimulator, get_shindo_color
+from eew_calculator import envelope_vectorized, envelope_multi_vectorized
+from main import EarthquakeSimulator, get_shindo_color, scale_icon, draw_ring, blit_s_wave_overlay
 
 
 class EEWRTSimulator(EarthquakeSimulator):
@@ -50,21 +51,19 @@ class EEWRTSimulator(EarthquakeSimulator):
             self._current_eq_id = id(self.earthquake)
             self._reset_for_new_eq()
 
-        self.station_intensities = {}
         self.region_max_intensities = {}
 
-        for station in self.stations:
-            lat = float(station['lat'])
-            lon = float(station['lon'])
+        intensities, is_s_waves = envelope_vectorized(
+            self.earthquake, self.st_x_km, self.st_y_km, self.st_amp
+        )
+        # 只遍历达到可见阈值的站点
+        hit = np.flatnonzero(intensities >= 0.5)
+        self._set_station_hits(hit, intensities[hit], is_s_waves[hit])
+        for i in hit:
+            station = self.stations[i]
             area_code = station['area']['code']
             area_name = station['area']['name']
-            amp = float(station.get('amp', 1.0))
-
-            intensity, is_s_wave = envelope_single(self.earthquake, lat, lon, amp=amp)
-            if intensity < 0.5:
-                continue
-
-            self.station_intensities[(lat, lon)] = (intensity, is_s_wave)
+            intensity = float(intensities[i])
             prev = self.region_max_intensities.get(area_code, 0.0)
             if intensity > prev:
                 self.region_max_intensities[area_code] = intensity
@@ -83,9 +82,10 @@ class EEWRTSimulator(EarthquakeSimulator):
 
         # FIX #2: Only trigger alert once, using the station with max intensity
         if not self._alert_fired_once and self.max_intensity >= 3.0:
-            if self.station_intensities:
-                max_station = max(self.station_intensities.items(), key=lambda x: x[1][0])
-                (lat, lon), (intensity, _) = max_station
+            if self.st_hit_idx.size:
+                k = int(np.argmax(self.st_hit_intensity))
+                lat, lon = self.st_keys[int(self.st_hit_idx[k])]
+                intensity = float(self.st_hit_intensity[k])
                 scale = intensity_to_scale(intensity)
                 self.max_triggered_intensity = intensity
                 self.alert_animations.append((lat, lon, self._current_time_value(), scale))
@@ -99,21 +99,19 @@ class EEWRTSimulator(EarthquakeSimulator):
             self._current_mgr_id = id(self.multi_manager)
             self._reset_for_new_eq()
 
-        self.station_intensities = {}
         self.region_max_intensities = {}
 
-        for station in self.stations:
-            lat = float(station['lat'])
-            lon = float(station['lon'])
+        intensities, is_s_waves = envelope_multi_vectorized(
+            self.multi_manager, self.st_x_km, self.st_y_km, self.st_amp
+        )
+        # 只遍历达到可见阈值的站点
+        hit = np.flatnonzero(intensities >= 0.5)
+        self._set_station_hits(hit, intensities[hit], is_s_waves[hit])
+        for i in hit:
+            station = self.stations[i]
             area_code = station['area']['code']
             area_name = station['area']['name']
-            amp = float(station.get('amp', 1.0))
-
-            intensity, is_s_wave = envelope_multi(self.multi_manager, lat, lon, amp=amp)
-            if intensity < 0.5:
-                continue
-
-            self.station_intensities[(lat, lon)] = (intensity, is_s_wave)
+            intensity = float(intensities[i])
             prev = self.region_max_intensities.get(area_code, 0.0)
             if intensity > prev:
                 self.region_max_intensities[area_code] = intensity
@@ -132,9 +130,10 @@ class EEWRTSimulator(EarthquakeSimulator):
 
         # FIX #2: Only trigger alert once, using the station with max intensity
         if not self._alert_fired_once and self.max_intensity >= 3.0:
-            if self.station_intensities:
-                max_station = max(self.station_intensities.items(), key=lambda x: x[1][0])
-                (lat, lon), (intensity, _) = max_station
+            if self.st_hit_idx.size:
+                k = int(np.argmax(self.st_hit_intensity))
+                lat, lon = self.st_keys[int(self.st_hit_idx[k])]
+                intensity = float(self.st_hit_intensity[k])
                 scale = intensity_to_scale(intensity)
                 self.max_triggered_intensity = intensity
                 self.alert_animations.append((lat, lon, self._current_time_value(), scale))
@@ -145,34 +144,26 @@ class EEWRTSimulator(EarthquakeSimulator):
         if self.sim_mode == "multi":
             if not self.multi_manager:
                 return
-            _, _, _, _, pixels_per_km, _, _ = self._view_km_params()
             # FIX #1: Use peak_intensity_ever instead of max_intensity for fixed color
             s_color = get_shindo_color(self.peak_intensity_ever) if self.peak_intensity_ever >= 0.5 else (128, 128, 128)
+            circles = self._multi_wave_screen_circles()
 
-            for circle in self.multi_manager.get_wave_circles():
-                cx, cy = self.latlon_to_screen(circle["lat"], circle["lon"])
-                p_px = int(circle["p_radius"] * pixels_per_km)
-                s_px = int(circle["s_radius"] * pixels_per_km)
+            for cx, cy, p_px, s_px in circles:
                 if p_px > 0 and p_px < self.screen.get_width() * 3:
-                    pygame.draw.circle(self.screen, (0, 150, 255), (cx, cy), p_px, 2)
+                    draw_ring(self.screen, (0, 150, 255), (cx, cy), p_px, 2)
                 if s_px > 0 and s_px < self.screen.get_width() * 3:
-                    pygame.draw.circle(self.screen, s_color, (cx, cy), s_px, 3)
+                    draw_ring(self.screen, s_color, (cx, cy), s_px, 3)
 
             icon_scale = min(0.8, max(0.2, 0.15 * self.zoom_level))
-            for src in self.multi_manager.sources:
-                if src.active:
-                    ex, ey = self.latlon_to_screen(src.lat, src.lon)
-                    if self.epicenter_icon:
-                        icon = pygame.transform.smoothscale(self.epicenter_icon, (
-                            int(self.epicenter_icon.get_width() * icon_scale),
-                            int(self.epicenter_icon.get_height() * icon_scale)
-                        ))
-                        rect = icon.get_rect(center=(ex, ey))
-                        self.screen.blit(icon, rect)
-                    else:
-                        s = max(8, int(15 * icon_scale))
-                        pygame.draw.line(self.screen, (255, 0, 0), (ex - s, ey), (ex + s, ey), 3)
-                        pygame.draw.line(self.screen, (255, 0, 0), (ex, ey - s), (ex, ey + s), 3)
+            for ex, ey, _, _ in circles:
+                if self.epicenter_icon:
+                    icon = scale_icon(self.epicenter_icon, icon_scale)
+                    rect = icon.get_rect(center=(ex, ey))
+                    self.screen.blit(icon, rect)
+                else:
+                    s = max(8, int(15 * icon_scale))
+                    pygame.draw.line(self.screen, (255, 0, 0), (ex - s, ey), (ex + s, ey), 3)
+                    pygame.draw.line(self.screen, (255, 0, 0), (ex, ey - s), (ex, ey + s), 3)
             return
 
         if not self.earthquake:
@@ -184,7 +175,7 @@ class EEWRTSimulator(EarthquakeSimulator):
         p_radius_km = self.earthquake.get_p_wave_radius()
         p_radius_px = int(p_radius_km * pixels_per_km)
         if p_radius_px > 0 and p_radius_px < self.screen.get_width() * 3:
-            pygame.draw.circle(self.screen, (0, 150, 255), (ex, ey), p_radius_px, 2)
+            draw_ring(self.screen, (0, 150, 255), (ex, ey), p_radius_px, 2)
 
         s_radius_km = self.earthquake.get_s_wave_radius()
         s_radius_px = int(s_radius_km * pixels_per_km)
@@ -211,22 +202,13 @@ class EEWRTSimulator(EarthquakeSimulator):
                 pygame.draw.arc(self.screen, prep_color, arc_rect, start_angle, end_angle, 3)
 
         if current_time >= s_arrival_time and s_radius_px > 0 and s_radius_px < self.screen.get_width() * 3:
-            pygame.draw.circle(self.screen, s_color, (ex, ey), s_radius_px, 3)
+            draw_ring(self.screen, s_color, (ex, ey), s_radius_px, 3)
             if self.s_wave_icon and s_radius_px > 10:
-                icon_size = s_radius_px * 2
-                icon = pygame.transform.smoothscale(self.s_wave_icon, (icon_size, icon_size))
-                tinted = icon.copy()
-                tinted.fill(s_color + (0,), special_flags=pygame.BLEND_RGB_MULT)
-                tinted.set_alpha(80)
-                rect = tinted.get_rect(center=(ex, ey))
-                self.screen.blit(tinted, rect)
+                blit_s_wave_overlay(self.screen, self.s_wave_icon, (ex, ey), s_radius_px, s_color)
 
         icon_scale = min(0.8, max(0.2, 0.15 * self.zoom_level))
         if self.epicenter_icon:
-            icon = pygame.transform.smoothscale(self.epicenter_icon, (
-                int(self.epicenter_icon.get_width() * icon_scale),
-                int(self.epicenter_icon.get_height() * icon_scale)
-            ))
+            icon = scale_icon(self.epicenter_icon, icon_scale)
             rect = icon.get_rect(center=(ex, ey))
             self.screen.blit(icon, rect)
         else:
@@ -8,7 +8,37 @@ EEW追标模式 - 模拟紧急地震速报的动态修正过程
 
 简化版B-Δ法：站点数越多，收敛越快
 """
-import random
+import logging
+
+import numpy as np
+
+# 修正过程日志：默认随根日志级别(WARNING)不输出，需要时用 logging.basicConfig(level=logging.INFO) 打开
+logger = logging.getLogger(__name__)
+
+# 误差/报告值数组按 [纬度, 经度, 深度(km), 震级] 排列，深度/震级段从此下标开始
+DEPTH = 2
+
+# 报告值的合法范围（深度0-1000km，震级1.0-9.5）
+_LOWER = np.array([-90.0, -180.0, 0.0, 1.0])
+_UPPER = np.array([90.0, 180.0, 1000.0, 9.5])
+
+# 收敛阈值：位置0.03度≈3km，深度<5km，震级<0.1
+_CONVERGENCE_THRESHOLDS = np.array([0.03, 0.03, 5.0, 0.1])
+
+# 推翻重来阈值（当误差过大时才大幅修正）
+# 与误差数组的 [深度, 震级] 段对应：深度误差>50km或震级误差>1.2时大幅修正
+_OVERTHROW_THRESHOLDS = np.array([50.0, 1.2])
+
+# 初始误差范围：位置±0.7度（约45-80km，真实EEW初期误差较大），
+# 深度±40km（深度估计较难），震级±0.7（P波M估计不稳定）
+_INITIAL_ERROR_RANGE = np.array([0.7, 0.7, 40.0, 0.7])
+
+# 正常修正的收敛率范围，按检测站点数分档，档位 = (站点>=20) + (站点>=50)
+# 站点越多，修正幅度越大（更有信心）- 简化版B-Δ法
+_DECAY_RATE_LOW = np.array([0.1, 0.15, 0.2])    # 少量 / 较多 / 大量站点
+_DECAY_RATE_HIGH = np.array([0.2, 0.25, 0.35])
+
+_RNG = np.random.default_rng()
 
 
 class EEWTracker:
@@ -21,6 +51,12 @@ class EEWTracker:
     3. 每次修正触发"訂正"（订正）通知
     """
 
+    __slots__ = (
+        'enabled', 'truth', 'errors', 'current',
+        'revision_count', 'last_detected_station_count', '_converged',
+        'needs_correction_announcement',
+    )
+
     def __init__(self, true_lat, true_lon, true_depth, true_mag, enabled=True):
         """
         初始化EEW追标器（站点驱动模式）
@@ -34,58 +70,34 @@ class EEWTracker:
         """
         self.enabled = enabled
 
-        # 真实值
-        self.true_lat = true_lat
-        self.true_lon = true_lon
-        self.true_depth = true_depth
-        self.true_mag = true_mag
+        # 真实值 [lat, lon, depth, mag]
+        self.truth = np.array([true_lat, true_lon, true_depth, true_mag], dtype=np.float64)
 
-        # 当前报告值（初始值有较大误差）
+        # 当前误差（用于逐步收敛），初始值有较大误差
         if enabled:
-            # 初始位置误差：±0.4-0.7度（约45-80km，真实EEW初期误差较大）
-            lat_error = random.uniform(-0.7, 0.7)
-            lon_error = random.uniform(-0.7, 0.7)
-            self.current_lat = true_lat + lat_error
-            self.current_lon = true_lon + lon_error
-
-            # 初始深度误差：±20-40km（深度估计较难）
-            depth_error = random.uniform(-40, 40)
-            self.current_depth = max(0, true_depth + depth_error)
-
-            # 初始震级误差：±0.4-0.7（P波M估计不稳定）
-            mag_error = random.uniform(-0.7, 0.7)
-            self.current_mag = max(1.0, min(9.5, true_mag + mag_error))
+            # 四项误差一次抽样
+            self.errors = _RNG.uniform(-_INITIAL_ERROR_RANGE, _INITIAL_ERROR_RANGE)
         else:
             # 禁用时直接使用真实值
-            self.current_lat = true_lat
-            self.current_lon = true_lon
-            self.current_depth = true_depth
-            self.current_mag = true_mag
+            self.errors = np.zeros(4)
+
+        # 当前报告值
+        self.current = np.empty(4)
+        self._apply_errors()
 
         # 追标状态（站点驱动模式）
         self.revision_count = 0  # 修正次数
+        # 是否已收敛；只在修正时更新（误差只会减小，收敛后结果固定）
+        self._converged = bool(np.all(np.abs(self.errors) < _CONVERGENCE_THRESHOLDS))
         self.last_detected_station_count = 0  # 上次检测到的站点数
-        self.convergence_threshold = 0.03  # 收敛阈值（位置0.03度≈3km）
-
-        # 当前误差（用于逐步收敛）
-        self.current_lat_error = lat_error if enabled else 0
-        self.current_lon_error = lon_error if enabled else 0
-        self.current_depth_error = depth_error if enabled else 0
-        self.current_mag_error = mag_error if enabled else 0
 
         # 是否需要播放"訂正"音频
         self.needs_correction_announcement = False
 
-        # 推翻重来阈值（当误差过大时才大幅修正）
-        self.overthrow_mag_threshold = 1.2  # 震级误差>1.2时大幅修正
-        self.overthrow_depth_threshold = 50  # 深度误差>50km时大幅修正
-
-        print(f"[EEW追标] {'启用' if enabled else '禁用'}")
+        logger.info("[EEW追标] %s", '启用' if enabled else '禁用')
         if enabled:
-            print(f"  初始值: ({self.current_lat:.2f}, {self.current_lon:.2f}), "
-                  f"{self.current_depth:.0f}km, M{self.current_mag:.1f}")
-            print(f"  真实值: ({self.true_lat:.2f}, {self.true_lon:.2f}), "
-                  f"{self.true_depth:.0f}km, M{self.true_mag:.1f}")
+            logger.info("  初始值: (%.2f, %.2f), %.0fkm, M%.1f", *self.current)
+            logger.info("  真实值: (%.2f, %.2f), %.0fkm, M%.1f", true_lat, true_lon, true_depth, true_mag)
 
     def update(self, detected_station_count, elapsed_time):
         """
@@ -100,11 +112,8 @@ class EEWTracker:
         Returns:
             bool: 是否发生了修正
         """
-        if not self.enabled:
-            return False
-
-        # 检查是否已收敛（接近真实值）
-        if self.is_converged():
+        # 已收敛（接近真实值）后不再修正；禁用时误差为0，构造时即已收敛
+        if self._converged:
             return False
 
         # 只在检测到新站点时才修正（站点数增加）
@@ -131,52 +140,43 @@ class EEWTracker:
         self.revision_count += 1
 
         # 检查是否需要大幅修正（误差过大）
-        mag_error_abs = abs(self.current_mag_error)
-        depth_error_abs = abs(self.current_depth_error)
+        depth_mag_abs = np.abs(self.errors[DEPTH:])
 
-        if mag_error_abs > self.overthrow_mag_threshold or depth_error_abs > self.overthrow_depth_threshold:
+        if (depth_mag_abs > _OVERTHROW_THRESHOLDS).any():
             # 大幅修正：意识到震级或深度完全错误
             # 减半误差（避免追标波突然跳跃）
-            self.current_lat_error *= 0.4
-            self.current_lon_error *= 0.4
-            self.current_depth_error *= 0.4
-            self.current_mag_error *= 0.4
-            print(f"[EEW追标] 第{self.revision_count}次修正 - **大幅修正** (站点:{detected_station_count}, t={elapsed_time:.1f}s)")
-            print(f"  原因: 震级误差{mag_error_abs:.1f}或深度误差{depth_error_abs:.0f}km过大")
+            self.errors *= 0.4
+            logger.info("[EEW追标] 第%d次修正 - **大幅修正** (站点:%d, t=%.1fs)",
+                        self.revision_count, detected_station_count, elapsed_time)
+            logger.info("  原因: 震级误差%.1f或深度误差%.0fkm过大", depth_mag_abs[1], depth_mag_abs[0])
         else:
             # 正常修正：误差逐步收敛
-            # 站点越多，修正幅度越大（更有信心）- 简化版B-Δ法
             # 但整体收敛速度要慢，让追标过程更明显
-            if detected_station_count >= 50:
-                decay_rate = random.uniform(0.2, 0.35)  # 大量站点：较快收敛
-            elif detected_station_count >= 20:
-                decay_rate = random.uniform(0.15, 0.25)  # 较多站点：适度收敛
-            else:
-                decay_rate = random.uniform(0.1, 0.2)  # 少量站点：缓慢收敛
-
-            self.current_lat_error *= (1 - decay_rate)
-            self.current_lon_error *= (1 - decay_rate)
-            self.current_depth_error *= (1 - decay_rate)
-            self.current_mag_error *= (1 - decay_rate)
+            bucket = (detected_station_count >= 20) + (detected_station_count >= 50)
+            decay_rate = _RNG.uniform(_DECAY_RATE_LOW[bucket], _DECAY_RATE_HIGH[bucket])
+
+            self.errors *= (1 - decay_rate)
 
         # 应用误差到当前值
-        self.current_lat = self.true_lat + self.current_lat_error
-        self.current_lon = self.true_lon + self.current_lon_error
-        self.current_depth = max(0, self.true_depth + self.current_depth_error)
-        self.current_mag = max(1.0, min(9.5, self.true_mag + self.current_mag_error))
+        self._apply_errors()
 
         # 标记需要播放"訂正"音频
         self.needs_correction_announcement = True
 
-        print(f"[EEW追标] 第{self.revision_count}次修正 (站点:{detected_station_count}, t={elapsed_time:.1f}s)")
-        print(f"  修正后: ({self.current_lat:.2f}, {self.current_lon:.2f}), "
-              f"{self.current_depth:.0f}km, M{self.current_mag:.1f}")
+        logger.info("[EEW追标] 第%d次修正 (站点:%d, t=%.1fs)",
+                    self.revision_count, detected_station_count, elapsed_time)
+        logger.info("  修正后: (%.2f, %.2f), %.0fkm, M%.1f", *self.current)
+
+        if np.all(np.abs(self.errors) < _CONVERGENCE_THRESHOLDS):
+            self._converged = True
+            logger.info("[EEW追标] 已收敛 - 完成%d回訂正", self.revision_count)
 
         return True
 
-    def _lerp(self, current, target, t):
-        """线性插值"""
-        return current + (target - current) * t
+    def _apply_errors(self):
+        """当前报告值 = 真实值 + 误差，并限制在合法范围内（原地写入）"""
+        np.add(self.truth, self.errors, out=self.current)
+        np.clip(self.current, _LOWER, _UPPER, out=self.current)
 
     def is_converged(self):
         """
@@ -185,27 +185,7 @@ class EEWTracker:
         Returns:
             bool: 是否已收敛（误差小于阈值）
         """
-        if not self.enabled:
-            return True
-
-        # 检查各项误差是否小于阈值
-        lat_error_abs = abs(self.current_lat_error)
-        lon_error_abs = abs(self.current_lon_error)
-        depth_error_abs = abs(self.current_depth_error)
-        mag_error_abs = abs(self.current_mag_error)
-
-        converged = (
-            lat_error_abs < self.convergence_threshold and
-            lon_error_abs < self.convergence_threshold and
-            depth_error_abs < 5 and  # 深度误差<5km
-            mag_error_abs < 0.1  # 震级误差<0.1
-        )
-
-        if converged and not hasattr(self, '_convergence_logged'):
-            print(f"[EEW追标] 已收敛 - 完成{self.revision_count}回訂正")
-            self._convergence_logged = True
-
-        return converged
+        return self._converged
 
     def get_current_values(self):
         """
@@ -214,8 +194,7 @@ class EEWTracker:
         Returns:
             tuple: (lat, lon, depth, mag)
         """
-        return (self.current_lat, self.current_lon,
-                self.current_depth, self.current_mag)
+        return tuple(self.current.tolist())
 
     def consume_correction_flag(self):
         """
@@ -236,7 +215,50 @@ class EEWTracker:
         Returns:
             bool: 是否已收敛到真实值
         """
-        return self.is_converged() or not self.enabled
+        return self._converged
+
+
+class _NullEEWTracker:
+    """
+    禁用追标时使用的空追标器：始终报告真实值，所有方法都是O(1)空操作
+
+    接口与 EEWTracker 相同，调用方无需再判断是否启用
+    """
+
+    __slots__ = ('_values',)
+
+    enabled = False
+    revision_count = 0
+
+    def __init__(self, true_lat, true_lon, true_depth, true_mag):
+        self._values = (true_lat, true_lon, true_depth, true_mag)
+
+    def update(self, detected_station_count, elapsed_time):
+        return False
+
+    def is_converged(self):
+        return True
+
+    def get_current_values(self):
+        return self._values
+
+    def consume_correction_flag(self):
+        return False
+
+    def is_tracking_complete(self):
+        return True
+
+
+def make_eew_tracker(true_lat, true_lon, true_depth, true_mag, enabled=True):
+    """
+    创建追标器：启用时返回 EEWTracker，禁用时返回空追标器
+
+    Returns:
+        EEWTracker 或 _NullEEWTracker
+    """
+    if enabled:
+        return EEWTracker(true_lat, true_lon, true_depth, true_mag)
+    return _NullEEWTracker(true_lat, true_lon, true_depth, true_mag)
 
 
 # ============================================================================
@@ -285,12 +307,15 @@ def test_eew_tracker():
     lat, lon, depth, mag = tracker.get_current_values()
     print(f"追标完成!")
     print(f"  最终值: ({lat:.2f}, {lon:.2f}), {depth:.0f}km, M{mag:.1f}")
-    print(f"  真实值: ({tracker.true_lat:.2f}, {tracker.true_lon:.2f}), "
-          f"{tracker.true_depth:.0f}km, M{tracker.true_mag:.1f}")
+    true_lat, true_lon, true_depth, true_mag = tracker.truth
+    print(f"  真实值: ({true_lat:.2f}, {true_lon:.2f}), "
+          f"{true_depth:.0f}km, M{true_mag:.1f}")
     print(f"  总修正次数: {tracker.revision_count}")
 
     print("\n" + "=" * 70)
 
 
 if __name__ == '__main__':
+    # 测试时输出追标过程日志
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     test_eew_tracker()
@@ -1,11 +1,14 @@
 """震央地名定位模块"""
 import json
+import math
 import os
 
 class EpicenterLocator:
     def __init__(self, geojson_path: str = None):
         """加载震央地名GeoJSON数据"""
         self.regions = []
+        # 1°×1° 网格：(floor(lat), floor(lon)) -> 包围盒覆盖该格的区域下标（保持区域原顺序）
+        self._grid = {}
         if geojson_path and os.path.exists(geojson_path):
             self.load_geojson(geojson_path)
 
@@ -23,10 +26,42 @@ class EpicenterLocator:
                 'name': props.get('name', ''),
                 'name_zh': props.get('name_zh-cn', props.get('name', '')),
                 'name_en': props.get('name_en', ''),
-                'geometry': geom
+                'geometry': geom,
+                'bbox': self._geometry_bbox(geom),
             }
             self.regions.append(region)
 
+        self._build_grid()
+
+    @staticmethod
+    def _geometry_bbox(geom: dict):
+        """外环的经纬度包围盒 (min_lon, min_lat, max_lon, max_lat)；无有效坐标时返回 None"""
+        geom_type = geom.get('type', '')
+        coords = geom.get('coordinates', [])
+        if geom_type == 'Polygon':
+            rings = [coords[0]] if coords else []
+        elif geom_type == 'MultiPolygon':
+            rings = [poly[0] for poly in coords if poly]
+        else:
+            return None
+        lons = [pt[0] for ring in rings for pt in ring]
+        lats = [pt[1] for ring in rings for pt in ring]
+        if not lons:
+            return None
+        return min(lons), min(lats), max(lons), max(lats)
+
+    def _build_grid(self):
+        """把每个区域登记到其包围盒覆盖的所有网格中"""
+        self._grid = {}
+        for idx, region in enumerate(self.regions):
+            bbox = region['bbox']
+            if bbox is None:
+                continue
+            min_lon, min_lat, max_lon, max_lat = bbox
+            for cell_lat in range(math.floor(min_lat), math.floor(max_lat) + 1):
+                for cell_lon in range(math.floor(min_lon), math.floor(max_lon) + 1):
+                    self._grid.setdefault((cell_lat, cell_lon), []).append(idx)
+
     def point_in_polygon(self, lon: float, lat: float, polygon: list) -> bool:
         """射线法判断点是否在多边形内"""
         n = len(polygon)
@@ -45,8 +80,12 @@ class EpicenterLocator:
         return inside
 
     def get_location_name(self, lon: float, lat: float, lang: str = 'zh') -> str:
-        """根据经纬度获取震央地名"""
-        for region in self.regions:
+        """根据经纬度获取震央地名（先按网格和包围盒筛选候选区域，再做多边形判断）"""
+        for idx in self._grid.get((math.floor(lat), math.floor(lon)), ()):
+            region = self.regions[idx]
+            min_lon, min_lat, max_lon, max_lat = region['bbox']
+            if not (min_lon <= lon <= max_lon and min_lat <= lat <= max_lat):
+                continue
             geom = region['geometry']
             geom_type = geom.get('type', '')
             coords = geom.get('coordinates', [])
@@ -1,5 +1,8 @@
 """JMA震度计算模块"""
 import math
+from bisect import bisect_right
+
+import numpy as np
 
 def calc_jma_intensity(magnitude: float, depth: float, epicentral_distance: float, bai: float = 1.0) -> float:
     """计算计测震度（对齐 Scratch 原版）。
@@ -52,6 +55,55 @@ def calc_jma_intensity(magnitude: float, depth: float, epicentral_distance: floa
 
     return max(0.0, min(7.0, float(intensity)))
 
+def calc_jma_intensity_batch(magnitude: float, depth: float, epicentral_distance, bai=1.0) -> np.ndarray:
+    """calc_jma_intensity 的数组版本（多个站点，可同时多个地震）。
+
+    参数
+    - magnitude / depth: 标量（同一地震），或可与距离广播的数组（如 (M,) 对应 (N,M) 距离矩阵的各列）
+    - epicentral_distance: 震央距离数组 (km)
+    - bai: 场地倍率派生量，标量或可与距离广播的数组
+    """
+    dist = np.asarray(epicentral_distance, dtype=np.float64)
+    if np.ndim(magnitude) == 0 and magnitude <= 0:
+        return np.zeros_like(dist)
+    magnitude = np.asarray(magnitude, dtype=np.float64)
+    depth = np.asarray(depth, dtype=np.float64)
+
+    kyori = np.maximum(0.001, np.hypot(dist, depth))
+
+    dep_eff = np.where(
+        depth < 154.609339438205,
+        depth,
+        1.505324359113294 + 1.1346691181025712 * depth - 0.0009340019684323403 * (depth**2),
+    )
+
+    bai = np.maximum(0.001, np.asarray(bai, dtype=np.float64))
+
+    m_half_pow = 10 ** (0.5 * magnitude)
+
+    denom = np.maximum(0.001, kyori + 0.0028 * m_half_pow)
+    log10_base = (
+        0.58 * magnitude
+        + 0.0038 * dep_eff
+        - 1.29
+        - np.log10(denom)
+        - 0.002 * kyori
+    )
+    base = 10 ** log10_base
+
+    bai_term = np.maximum(0.001, bai * (2.0 + 0.1833584358 * np.log(bai)))
+    strength = base * (10 ** (2.367 - 0.852 * np.log10(400.0 / bai_term)))
+
+    strength = np.maximum(0.001, strength)
+    l = np.log10(strength)
+    intensity_hi = 2.002 + 2.603 * l - 0.213 * (l * l)
+    intensity_lo = 2.165 + 2.262 * l
+    intensity = np.where(intensity_hi > 4.0, intensity_hi, intensity_lo)
+    if magnitude.ndim:
+        intensity = np.where(magnitude > 0, intensity, 0.0)
+
+    return np.clip(intensity, 0.0, 7.0)
+
 def calc_intensity_from_pga(pga: float) -> float:
     """
     从加速度计算震度
@@ -64,28 +116,21 @@ def calc_intensity_from_pga(pga: float) -> float:
         return 0
     return 2.0 * math.log10(pga) + 0.94
 
+# 震度阶级分界（计测震度）与对应阶级；阶级下标 0-9 同时也是图标编号
+_SCALE_THRESHOLDS = (0.5, 1.5, 2.5, 3.5, 4.5, 5.0, 5.5, 6.0, 6.5)
+_SCALE_NAMES = ("0", "1", "2", "3", "4", "5-", "5+", "6-", "6+", "7")
+
+def intensity_to_scale_index(intensity: float) -> int:
+    """将计测震度转换为震度阶级下标：0→0, 1→1, ..., 5-→5, 5+→6, 6-→7, 6+→8, 7→9"""
+    return bisect_right(_SCALE_THRESHOLDS, intensity)
+
+def intensity_to_scale_indices(intensities) -> np.ndarray:
+    """intensity_to_scale_index 的数组版本（searchsorted 右侧插入，与 bisect_right 一致）"""
+    return np.searchsorted(_SCALE_THRESHOLDS, intensities, side='right')
+
 def intensity_to_scale(intensity: float) -> str:
     """将计测震度转换为震度阶级"""
-    if intensity < 0.5:
-        return "0"
-    elif intensity < 1.5:
-        return "1"
-    elif intensity < 2.5:
-        return "2"
-    elif intensity < 3.5:
-        return "3"
-    elif intensity < 4.5:
-        return "4"
-    elif intensity < 5.0:
-        return "5-"
-    elif intensity < 5.5:
-        return "5+"
-    elif intensity < 6.0:
-        return "6-"
-    elif intensity < 6.5:
-        return "6+"
-    else:
-        return "7"
+    return _SCALE_NAMES[bisect_right(_SCALE_THRESHOLDS, intensity)]
 
 def get_intensity_color(intensity: float) -> tuple:
     """根据震度返回颜色 (RGB)"""
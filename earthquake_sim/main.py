@@ -1,11 +1,20 @@
 """地震模拟器主程序 - pygame可视化"""
 import pygame
+import pygame.gfxdraw
+# 事件循环里直接用模块级名字，省去每次比较时的 pygame.XXX 属性查找
+from pygame.locals import (
+    KEYDOWN, MOUSEBUTTONDOWN, MOUSEWHEEL, QUIT,
+    K_DOWN, K_EQUALS, K_LEFT, K_MINUS, K_PLUS, K_RETURN, K_RIGHT, K_SPACE, K_TAB, K_UP, K_c, K_d, K_r, K_s, K_t, K_v,
+)
 import json
+import logging
 import math
 import os
 import sys
 import io
 
+import numpy as np
+
 try:
     import cairosvg
     CAIRO_AVAILABLE = True
@@ -15,39 +24,161 @@ except (ImportError, OSError):
 
 from config import *
 from earthquake import Earthquake
-from intensity import calc_jma_intensity, intensity_to_scale, get_intensity_color
+from intensity import calc_jma_intensity, calc_jma_intensity_batch, intensity_to_scale, intensity_to_scale_index, get_intensity_color
 from epicenter import EpicenterLocator
 from map_renderer import MapRenderer
 from multisource import MultiSourceManager, RuptureSource
-from projection import latlon_to_xy_km, xy_km_to_latlon
+from projection import latlon_to_xy_km, latlons_to_xy_km, xy_km_to_latlon, xys_km_to_latlons
 from sound_manager import SoundManager
-from eew_tracker import EEWTracker
-from station_manager import StationManager
+from surface_cache import SurfaceCache
+from text_cache import render_text
+from eew_tracker import make_eew_tracker
+from station_manager import StationManager, scale_icon
 from earthquake_history import EarthquakeHistory
 
 # 显示模式
 MODE_STATION = 0  # 站点模式
 MODE_REGION = 1   # 区域模式
 
+def _svg_cache_path(path, scale):
+    """SVG渲染结果的PNG缓存路径：同目录下 _cache/<文件名>@<倍率>.png"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(os.path.dirname(path), "_cache", f"{stem}@{scale:g}.png")
+
+def _finish_icon(surface):
+    """显示已初始化时转换为屏幕像素格式（带alpha），避免每次blit时再做格式转换"""
+    if pygame.display.get_surface() is not None:
+        return surface.convert_alpha()
+    return surface
+
 def load_svg(path, scale=1.0):
-    """加载SVG文件并转换为pygame surface"""
+    """加载SVG文件并转换为pygame surface
+
+    渲染出的PNG缓存到 _cache/ 目录，缓存比SVG新时直接读取，跳过Cairo渲染
+    """
+    cache_path = _svg_cache_path(path, scale)
+    try:
+        if os.path.getmtime(cache_path) >= os.path.getmtime(path):
+            return _finish_icon(pygame.image.load(cache_path))
+    except (OSError, pygame.error):
+        pass
+
     if not CAIRO_AVAILABLE:
         return None
     try:
         png_data = cairosvg.svg2png(url=path, scale=scale)
-        return pygame.image.load(io.BytesIO(png_data))
+        surface = pygame.image.load(io.BytesIO(png_data))
     except Exception as e:
         print(f"Warning: Failed to load SVG {path}: {e}")
         return None
 
-def scale_icon(icon, factor):
-    """缩放图标"""
-    if icon is None:
-        return None
-    w, h = icon.get_size()
-    new_w = max(1, int(w * factor))
-    new_h = max(1, int(h * factor))
-    return pygame.transform.smoothscale(icon, (new_w, new_h))
+    # 写缓存失败（如只读目录）不影响本次加载
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, "wb") as f:
+            f.write(png_data)
+    except OSError:
+        pass
+    return _finish_icon(surface)
+
+# 着色结果缓存：原图 × 颜色 -> 着色图
+_TINTED_ICON_CACHE = SurfaceCache(256)
+
+def tint_icon(icon, color):
+    """用 BLEND_MULT 给图标着色（同一图标同一颜色只做一次copy+fill，返回的Surface不要原地修改）"""
+    key = tuple(color)
+    tinted = _TINTED_ICON_CACHE.get(icon, key)
+    if tinted is None:
+        tinted = icon.copy()
+        tinted.fill(color, special_flags=pygame.BLEND_MULT)
+        _TINTED_ICON_CACHE.put(icon, key, tinted)
+    return tinted
+
+# S波円.svg 叠加层：按颜色着色后预缩放成几档尺寸（smoothscale 只做一次），
+# 逐帧从不小于目标的最近一档做一次最近邻缩放；颜色只在最大震度变化时改变，只保留少量颜色。
+# 放大后的圆常常远大于屏幕，只缩放落在屏幕内的那一块
+_SWAVE_MIP_SIZES = (128, 256, 512, 1024, 2048)
+_SWAVE_MIP_CACHE = SurfaceCache(4)  # 原图 × 颜色 -> [各档Surface]
+
+def blit_s_wave_overlay(surface, icon, center, radius, color, alpha=80):
+    """把円.svg 着色为 color、缩放成半径 radius、整体透明度 alpha，以 center 为中心画到 surface 上"""
+    size = radius * 2
+    dest = pygame.Rect(0, 0, size, size)
+    dest.center = center
+    visible = dest.clip(surface.get_clip())
+    if visible.width <= 0 or visible.height <= 0:
+        return
+    key = tuple(color)
+    mips = _SWAVE_MIP_CACHE.get(icon, key)
+    if mips is None:
+        tinted = icon.copy()
+        tinted.fill(key + (0,), special_flags=pygame.BLEND_RGB_MULT)
+        mips = _SWAVE_MIP_CACHE.put(
+            icon, key, [pygame.transform.smoothscale(tinted, (s, s)) for s in _SWAVE_MIP_SIZES]
+        )
+    base = next((m for m in mips if m.get_width() >= size), mips[-1])
+    # 可见区域映射回源图坐标（向外取整），再按同一比例缩放，保证与整图缩放的位置一致
+    k = base.get_width() / size
+    x0 = int((visible.left - dest.left) * k)
+    y0 = int((visible.top - dest.top) * k)
+    x1 = min(base.get_width(), math.ceil((visible.right - dest.left) * k))
+    y1 = min(base.get_height(), math.ceil((visible.bottom - dest.top) * k))
+    if x1 <= x0 or y1 <= y0:
+        return
+    px0, py0 = round(x0 / k), round(y0 / k)
+    pw, ph = round(x1 / k) - px0, round(y1 / k) - py0
+    if pw <= 0 or ph <= 0:
+        return
+    piece = pygame.transform.scale(base.subsurface((x0, y0, x1 - x0, y1 - y0)), (pw, ph))
+    piece.set_alpha(alpha)
+    surface.blit(piece, (dest.left + px0, dest.top + py0))
+
+# gfxdraw 使用16位有符号坐标
+_GFXDRAW_LIMIT = 32767
+
+# 图标视口裁剪的外扩边距（像素）：中心点在屏幕外但图标仍可能部分可见
+_ICON_CULL_MARGIN = 64
+
+def draw_ring(surface, color, center, radius, width):
+    """绘制波前圆环：一次粗线宽的 draw.circle，内外两条边各补一条 gfxdraw.aacircle 抗锯齿
+
+    先按屏幕范围裁剪：圆环与屏幕不相交（在屏幕外，或屏幕整个落在内圆里）时不画；
+    圆心在屏幕外且圆环超出 gfxdraw 坐标范围时，只画屏幕可见的那段圆弧
+    """
+    cx, cy = center
+    w, h = surface.get_size()
+
+    # 外接矩形与屏幕不相交
+    if cx + radius < 0 or cy + radius < 0 or cx - radius > w or cy - radius > h:
+        return
+
+    # 屏幕四角都在内圆里：圆环整个在屏幕外
+    far_dx = max(abs(cx), abs(cx - w))
+    far_dy = max(abs(cy), abs(cy - h))
+    inner = radius - width
+    if inner > 0 and far_dx * far_dx + far_dy * far_dy < inner * inner:
+        return
+
+    if max(abs(cx), abs(cy)) + radius < _GFXDRAW_LIMIT:
+        pygame.draw.circle(surface, color, center, radius, width)
+        pygame.gfxdraw.aacircle(surface, cx, cy, radius, color)
+        if 1 < width < radius:
+            pygame.gfxdraw.aacircle(surface, cx, cy, radius - width + 1, color)
+        return
+
+    rect = pygame.Rect(cx - radius, cy - radius, radius * 2, radius * 2)
+    if 0 <= cx <= w and 0 <= cy <= h:
+        pygame.draw.circle(surface, color, center, radius, width)
+        return
+
+    # 圆心在屏幕外：屏幕相对圆心的张角不超过180°，以屏幕中心方向为基准取四角的角度范围
+    # （pygame.draw.arc 的角度为逆时针、y轴向上）
+    base = math.atan2(cy - h / 2, w / 2 - cx)
+    offsets = []
+    for x, y in ((0, 0), (w, 0), (0, h), (w, h)):
+        a = math.atan2(cy - y, x - cx) - base
+        offsets.append((a + math.pi) % (2 * math.pi) - math.pi)
+    pygame.draw.arc(surface, color, rect, base + min(offsets), base + max(offsets), width)
 
 # 震度颜色映射（与intensity.py的get_intensity_color()保持一致）
 SHINDO_COLORS = {
@@ -62,16 +193,83 @@ SHINDO_COLORS = {
     9: (100, 0, 100),     # 震度7 - 紫色
 }
 
+def preparse_feature_rings(feature):
+    """把 GeoJSON 要素的外环预解析为连续数组（加载时调用一次）。
+
+    返回 (lonlat, xy_km, offsets)：lonlat/xy_km 为 (N,2) 数组，第 i 个环是
+    [offsets[i], offsets[i+1]) 区间；不是多边形或没有有效环时返回 None。
+    """
+    geom = feature.get('geometry', {})
+    coords = geom.get('coordinates', [])
+    geom_type = geom.get('type', '')
+    if geom_type == 'Polygon':
+        polys = [coords[0]]
+    elif geom_type == 'MultiPolygon':
+        polys = [c[0] for c in coords]
+    else:
+        return None
+    polys = [poly for poly in polys if len(poly) >= 3]
+    if not polys:
+        return None
+    lonlat = np.array([pt[:2] for poly in polys for pt in poly], dtype=np.float64)
+    offsets = np.cumsum([0] + [len(poly) for poly in polys])
+    x_km, y_km = latlons_to_xy_km(lonlat[:, 1], lonlat[:, 0])
+    return lonlat, np.column_stack((x_km, y_km)), offsets
+
+def simplify_ring(points, tol):
+    """Douglas–Peucker 折线化简（迭代版），points 为 (N,2) 数组，tol 与坐标同单位"""
+    n = len(points)
+    if n <= 4:
+        return points
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2:
+            continue
+        p0 = points[a]
+        dx, dy = points[b] - p0
+        seg = points[a + 1:b] - p0
+        length = math.hypot(dx, dy)
+        if length < 1e-12:
+            # 闭合环首尾重合：退化为到端点的距离
+            dist = np.hypot(seg[:, 0], seg[:, 1])
+        else:
+            dist = np.abs(dx * seg[:, 1] - dy * seg[:, 0]) / length
+        i = int(np.argmax(dist))
+        if dist[i] > tol:
+            mid = a + 1 + i
+            keep[mid] = True
+            stack.append((a, mid))
+            stack.append((mid, b))
+    simplified = points[keep]
+    return simplified if len(simplified) >= 4 else points
+
+def simplify_rings(xy_km, offsets, tol_km):
+    """对预解析要素的每个环做化简，返回新的 (xy_km, offsets)"""
+    rings = [simplify_ring(xy_km[offsets[i]:offsets[i + 1]], tol_km) for i in range(len(offsets) - 1)]
+    return np.concatenate(rings), np.cumsum([0] + [len(r) for r in rings])
+
+def rings_bboxes(rings):
+    """各要素的 km 平面包围盒 (N,4)：x_min, y_min, x_max, y_max"""
+    if not rings:
+        return np.empty((0, 4), dtype=np.float64)
+    return np.array([np.concatenate((xy.min(axis=0), xy.max(axis=0))) for xy, _ in rings])
+
 def get_shindo_color(intensity):
     """根据震度值获取颜色"""
-    scale = intensity_to_scale(intensity)
-    idx_map = {'1':1, '2':2, '3':3, '4':4, '5-':5, '5+':6, '6-':7, '6+':8, '7':9}
-    idx = idx_map.get(scale, 3)
+    # 震度0没有对应颜色，沿用震度3的颜色
+    idx = intensity_to_scale_index(intensity) or 3
     return SHINDO_COLORS.get(idx, (0xED, 0xAA, 0x00))
 
 class EarthquakeSimulator:
     def __init__(self):
+        # 小缓冲区降低播报起音延迟；必须在 pygame.init() 之前设置
+        pygame.mixer.pre_init(AUDIO_FREQUENCY, -16, 2, AUDIO_BUFFER_SIZE)
         pygame.init()
+        # 控制台输出EEW追标的修正过程（与其它模块的 print 输出格式一致）
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
         pygame.key.set_repeat(200, 50)  # 长按支持
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("地震波到达时间模拟器")
@@ -104,15 +302,31 @@ class EarthquakeSimulator:
         geojson_path = os.path.join(os.path.dirname(__file__),
                                      "../JMA_Region-main/震央地名.geojson")
         self.locator = EpicenterLocator(geojson_path if os.path.exists(geojson_path) else None)
+        # 地名查询是逐区域 point-in-polygon，按坐标缓存结果与渲染好的文字
+        self._loc_cache = {}  # (lat, lon, lang) -> 地名
+        self._hud_strings = {}  # HUD行名 -> (输入值, 格式化后的字符串)
 
         # 加载都道府县地图（用于显示日本轮廓）
         pref_path = os.path.join(os.path.dirname(__file__),
                                   "../JMA_Region-main/prefectures.geojson")
-        self.prefectures = []
+        prefectures = []
         if os.path.exists(pref_path):
             with open(pref_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-                self.prefectures = data.get('features', [])
+                prefectures = data.get('features', [])
+        # 预解析都道府县外环：km 坐标数组 + 环偏移，绘制时只做一次仿射变换
+        # 原始 GeoJSON 要素只在这里用到，解析后不再保留
+        self.prefecture_rings = []  # [(xy_km, offsets), ...]
+        for pref in prefectures:
+            parsed = preparse_feature_rings(pref)
+            if parsed is not None:
+                self.prefecture_rings.append(parsed[1:])
+        self.prefecture_bboxes = rings_bboxes(self.prefecture_rings)
+        # 低缩放时使用化简后的外环（容差见 config.PREFECTURE_SIMPLIFY_TOL_KM）
+        self.prefecture_rings_lod = [
+            simplify_rings(xy_km, offsets, PREFECTURE_SIMPLIFY_TOL_KM)
+            for xy_km, offsets in self.prefecture_rings
+        ]
 
         # 地图参数
         self.map_bounds = MAP_BOUNDS.copy()
@@ -126,6 +340,7 @@ class EarthquakeSimulator:
         self.multi_state = "draw_fault"  # draw_fault -> place_sources -> choose_start -> ready
         self.fault_line = []  # [(lat, lon), ...]
         self.multi_sources = []  # [RuptureSource]
+        self._multi_sources_xy = np.empty((0, 2), dtype=np.float64)  # 与 multi_sources 同序的 (lat, lon)
         self.multi_manager: MultiSourceManager | None = None
         self.multi_direction = "forward"
         self.multi_start_source = None
@@ -133,6 +348,7 @@ class EarthquakeSimulator:
 
         # 设置模式
         self.setting_mode = True
+        self._kbd_dispatch = self._build_kbd_dispatch()  # 界面状态 -> {按键: 处理函数}
         self.temp_lat = 35.7
         self.temp_lon = 139.7
         self.temp_depth = 10
@@ -181,17 +397,23 @@ class EarthquakeSimulator:
         # 加载图标
         self.load_icons()
 
+        # 预渲染模式切换按钮（两种状态各一张，绘制时直接 blit）
+        self._mode_btn_surfs = {
+            mode: self._render_button((80, 30), text, self.font_cn, (40, 40, 60), (100, 100, 120))
+            for mode, text in ((MODE_STATION, "站点"), (MODE_REGION, "区域"))
+        }
+
+        # 区域填色用的常驻半透明图层（每帧复用，不再逐帧分配整屏 Surface）
+        self._region_overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA).convert_alpha()
+
         # 加载站点和区域数据
         self.stations = []
         self.regions_data = []  # 细分区域（用于填色）
         self.load_station_region_data()
 
-        # 加载音频
-        pygame.mixer.init()
-
         # 初始化音频管理器（使用Scratch项目的高质量音频）
         try:
-            self.sound_manager = SoundManager()
+            self.sound_manager = SoundManager(buffer_size=AUDIO_BUFFER_SIZE)
             print("[主程序] 音频管理器已加载")
         except Exception as e:
             print(f"[主程序] 音频管理器加载失败: {e}")
@@ -208,10 +430,12 @@ class EarthquakeSimulator:
         # 白色圆圈闪烁动画
         self.max_triggered_intensity = 0.0  # 已触发的最大震度值
         self.alert_animations = []  # 动画队列: [(lat, lon, start_time, scale), ...]
+        self._alert_ring_sprites = {}  # 半径 -> 不透明白色圆环（按需预渲染，绘制时用 set_alpha 调透明度）
 
         # 站点震度闪烁动画（震度3+首次触发时的彩色闪烁）
         self.station_flash_animations = []  # [(lat, lon, start_time, intensity), ...]
         self.intensity_flash_counts = {}  # 每个震度等级的闪烁次数计数 {'3': 0, '4': 0, ...}
+        self._flash_sprites = {}  # 颜色 -> 不透明实心圆（半径固定）
 
         # EEW警报音播放控制
         self.eew_alert_played = False  # 是否已播放EEW警报音（等到站点检测到地震波才播放）
@@ -288,6 +512,22 @@ class EarthquakeSimulator:
             with open(stations_path, 'r', encoding='utf-8') as f:
                 self.stations = json.load(f)
 
+        # 站点坐标/倍率的数组形式（与 self.stations 顺序一致，供向量化震度计算使用）
+        self.st_lat = np.array([float(st['lat']) for st in self.stations], dtype=np.float64)
+        self.st_lon = np.array([float(st['lon']) for st in self.stations], dtype=np.float64)
+        self.st_amp = np.array([float(st.get('amp', 1.0)) for st in self.stations], dtype=np.float64)
+        self.st_x_km, self.st_y_km = latlons_to_xy_km(self.st_lat, self.st_lon)
+        # station_intensities 的字典键 (lat, lon)，预先转成 Python float 元组
+        self.st_keys = list(zip(self.st_lat.tolist(), self.st_lon.tolist()))
+        self._clear_station_hits()
+        # Scratch 兼容：场地系数 amp 先变换成 bai 再参与震度计算
+        self.st_bai = (self.st_amp * 4 + self.st_amp * self.st_amp) / 5.0
+        # 站点所属区域：区域代码表 + 每站下标（用于按区域取最大震度）
+        self.st_area_codes, self.st_area_idx = np.unique(
+            np.array([st['area']['code'] for st in self.stations], dtype=str),
+            return_inverse=True,
+        )
+
         # 加载细分区域多边形（高精度版本用于填色）
         regions_path = os.path.join(data_dir, "area_forecast_hires.geojson")
         if not os.path.exists(regions_path):
@@ -298,6 +538,37 @@ class EarthquakeSimulator:
                 data = json.load(f)
                 self.regions_data = data.get('features', [])
 
+        # 预处理区域：外环预解析为 km 坐标数组，按代码分组，并一次性算好中心点（顶点平均）
+        self.region_rings = []  # [(xy_km, offsets), ...]
+        self.region_rings_lonlat = []  # 与 region_rings 同序的经纬度外环（站点归属判定用）
+        self.region_ring_codes = []  # 与 region_rings 同序的区域代码
+        self.region_names = {}  # code -> name
+        self.region_features_by_code = {}  # code -> [(ring_idx, centroid_lat, centroid_lon), ...]
+        centroids = []  # 与 region_rings 同序的 (lat, lon)
+        for region in self.regions_data:
+            parsed = preparse_feature_rings(region)
+            if parsed is None:
+                continue
+            lonlat, xy_km, offsets = parsed
+            props = region.get('properties', {})
+            code = props.get('code', '')
+            self.region_names.setdefault(code, props.get('name', ''))
+            centroid_lon, centroid_lat = lonlat.mean(axis=0)
+            self.region_features_by_code.setdefault(code, []).append(
+                (len(self.region_rings), float(centroid_lat), float(centroid_lon))
+            )
+            centroids.append((centroid_lat, centroid_lon))
+            self.region_rings.append((xy_km, offsets))
+            self.region_rings_lonlat.append((lonlat, offsets))
+            self.region_ring_codes.append(code)
+        self.region_bboxes = rings_bboxes(self.region_rings)  # (N,4)，用于视口裁剪
+        # 各环中心点的 km 坐标 (N,2)（与 region_rings 同序），视图变化后一次批量投影
+        centroids = np.array(centroids, dtype=np.float64).reshape(-1, 2)
+        self.region_centroids_km = np.column_stack(latlons_to_xy_km(centroids[:, 0], centroids[:, 1]))
+        self._region_label_cache_key = None
+        self._region_label_cache = {}  # code -> [(cx, cy), ...]，随视图变化失效
+        self._region_screen_cache = {}  # ring_idx -> 各环屏幕点列表，随视图变化失效
+
     def _view_km_params(self) -> tuple[float, float, float, float, float, float, float]:
         """把当前 map_bounds 转成 km 平面范围与屏幕映射参数（统一比例）。
 
@@ -330,22 +601,83 @@ class EarthquakeSimulator:
         params = (x_min_km, x_max_km, y_min_km, y_max_km, pixels_per_km, x_offset, y_offset)
         self._view_cache_key = cache_key
         self._view_cache_params = params
+        # km → 屏幕是仿射变换，常数项折叠后每个坐标只需一次乘加
+        self._view_affine_params = (
+            pixels_per_km,
+            x_offset - x_min_km * pixels_per_km,
+            y_offset + y_max_km * pixels_per_km,
+        )
         return params
 
+    def _view_affine(self) -> tuple[float, float, float]:
+        """当前视图的屏幕仿射参数 (ppk, bx, by)：sx = ppk * x_km + bx，sy = by - ppk * y_km"""
+        self._view_km_params()
+        return self._view_affine_params
+
     def latlon_to_screen(self, lat: float, lon: float) -> tuple:
         """经纬度转屏幕坐标（Scratch 兼容投影，波前为正圆）。"""
-        x_min_km, x_max_km, y_min_km, y_max_km, ppk, x_off, y_off = self._view_km_params()
+        ppk, bx, by = self._view_affine()
         x_km, y_km = latlon_to_xy_km(lat, lon)
-        sx = x_off + (x_km - x_min_km) * ppk
-        sy = y_off + (y_max_km - y_km) * ppk
-        return int(sx), int(sy)
+        return int(ppk * x_km + bx), int(by - ppk * y_km)
+
+    def _make_project_func(self):
+        """返回绑定当前视图参数的投影函数 project(lat, lon) -> (sx, sy)
+
+        视图参数在创建时一次解包为闭包局部变量，逐点循环里代替 latlon_to_screen，
+        省去每点的缓存查询与元组解包；视图变化后需重新创建
+        """
+        ppk, bx, by = self._view_affine()
+        to_xy_km = latlon_to_xy_km
+
+        def project(lat: float, lon: float) -> tuple:
+            x_km, y_km = to_xy_km(lat, lon)
+            return int(ppk * x_km + bx), int(by - ppk * y_km)
+
+        return project
+
+    def _view_km_rect(self) -> tuple[float, float, float, float]:
+        """当前屏幕可见的 km 平面范围（含居中留白）：x_min, y_min, x_max, y_max"""
+        # 屏幕 (0, 0) 对应的 km 坐标
+        ppk, bx, by = self._view_affine()
+        vx0 = -bx / ppk
+        vy1 = by / ppk
+        return vx0, vy1 - WINDOW_HEIGHT / ppk, vx0 + WINDOW_WIDTH / ppk, vy1
+
+    def _visible_rings(self, bboxes: np.ndarray) -> np.ndarray:
+        """返回包围盒与屏幕相交的要素下标"""
+        if len(bboxes) == 0:
+            return np.empty(0, dtype=np.intp)
+        vx0, vy0, vx1, vy1 = self._view_km_rect()
+        visible = (
+            (bboxes[:, 2] >= vx0) & (bboxes[:, 0] <= vx1)
+            & (bboxes[:, 3] >= vy0) & (bboxes[:, 1] <= vy1)
+        )
+        return np.flatnonzero(visible)
+
+    def km_to_screen_batch(self, x_km: np.ndarray, y_km: np.ndarray) -> np.ndarray:
+        """km 平面坐标数组批量转屏幕坐标，返回 (N,2) int32 数组（与 latlon_to_screen 同样向零取整）"""
+        ppk, bx, by = self._view_affine()
+        out = np.empty((len(x_km), 2), dtype=np.float64)
+        np.multiply(x_km, ppk, out=out[:, 0])
+        np.multiply(y_km, -ppk, out=out[:, 1])
+        out[:, 0] += bx
+        out[:, 1] += by
+        return out.astype(np.int32)
+
+    def latlons_to_screen(self, lats, lons) -> np.ndarray:
+        """经纬度数组批量转屏幕坐标，返回 (N,2) int32 数组"""
+        x_km, y_km = latlons_to_xy_km(np.asarray(lats, dtype=np.float64), np.asarray(lons, dtype=np.float64))
+        return self.km_to_screen_batch(x_km, y_km)
+
+    def rings_to_screen(self, xy_km: np.ndarray, offsets: np.ndarray) -> list:
+        """把预解析的 km 坐标数组整体变换到屏幕，按偏移拆回各环的点列表"""
+        points = self.km_to_screen_batch(xy_km[:, 0], xy_km[:, 1]).tolist()
+        return [points[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
 
     def screen_to_latlon(self, x: int, y: int) -> tuple:
         """屏幕坐标转经纬度（Scratch 兼容投影）。"""
-        x_min_km, x_max_km, y_min_km, y_max_km, ppk, x_off, y_off = self._view_km_params()
-        x_km = x_min_km + (x - x_off) / ppk
-        y_km = y_max_km - (y - y_off) / ppk
-        return xy_km_to_latlon(x_km, y_km)
+        ppk, bx, by = self._view_affine()
+        return xy_km_to_latlon((x - bx) / ppk, (by - y) / ppk)
 
     # --- 多震源辅助方法 --------------------------------------------------
     def _current_time_value(self) -> float:
@@ -356,16 +688,37 @@ class EarthquakeSimulator:
             return self.earthquake.time
         return 0.0
 
+    def location_name(self, lat: float, lon: float, lang: str = 'ja') -> str:
+        """带缓存的震央地名查询（坐标取到小数点后3位作为键）"""
+        key = (round(lat, 3), round(lon, 3), lang)
+        name = self._loc_cache.get(key)
+        if name is None:
+            name = self.locator.get_location_name(lon, lat, lang)
+            self._loc_cache[key] = name
+        return name
+
+    def clear_location_cache(self):
+        """清空地名缓存（重置/新地震时调用）"""
+        self._loc_cache.clear()
+
+    def _sync_multi_sources_xy(self):
+        """multi_sources 增删后重建坐标数组（供起点选择的最近点搜索使用）"""
+        self._multi_sources_xy = np.array(
+            [(src.lat, src.lon) for src in self.multi_sources], dtype=np.float64
+        ).reshape(-1, 2)
+
     def reset_multi_setup(self):
         """清空多震源设置状态。"""
+        self.clear_location_cache()
         self.fault_line = []
         self.multi_sources = []
+        self._sync_multi_sources_xy()
         self.multi_state = "draw_fault"
         self.multi_start_source = None
         self.multi_direction = "forward"
         self.multi_manager = None
         self.region_intensities = {}
-        self.station_intensities = {}
+        self._clear_station_hits()
         self.region_max_intensities = {}
         self.max_intensity = 0
         self.max_intensity_location = ""
@@ -387,37 +740,38 @@ class EarthquakeSimulator:
         self.zoom_level = 1.0
         self.reset_auto_tracking()  # 重置追踪状态
 
+    def _fault_segments(self):
+        """断层折线的线段数据（km平面），折线变化时重建。
+
+        返回 (起点数组, 方向向量数组, 长度平方数组)，退化线段的长度平方为 inf。
+        """
+        key = tuple(self.fault_line)
+        if getattr(self, "_fault_segments_key", None) != key:
+            lats, lons = zip(*self.fault_line)
+            xs, ys = latlons_to_xy_km(lats, lons)
+            pts = np.column_stack((xs, ys))
+            v = pts[1:] - pts[:-1]
+            seg_len2 = (v * v).sum(axis=1)
+            seg_len2[seg_len2 <= 1e-9] = np.inf
+            self._fault_segments_key = key
+            self._fault_segments_cache = (pts[:-1], v, seg_len2)
+        return self._fault_segments_cache
+
     def project_to_fault(self, lat: float, lon: float) -> tuple:
         """将点投影到当前断层折线，返回投影点（若无折线则原样返回）。"""
         if len(self.fault_line) < 2:
             return lat, lon
-        km_points = [latlon_to_xy_km(p[0], p[1]) for p in self.fault_line]
-        px, py = latlon_to_xy_km(lat, lon)
-        best = None
-        best_d2 = float("inf")
-        cumulative = [0.0]
-        for i in range(1, len(km_points)):
-            x0, y0 = km_points[i - 1]
-            x1, y1 = km_points[i]
-            cumulative.append(cumulative[-1] + math.hypot(x1 - x0, y1 - y0))
-        for i in range(len(km_points) - 1):
-            (x0, y0), (x1, y1) = km_points[i], km_points[i + 1]
-            vx, vy = x1 - x0, y1 - y0
-            seg_len2 = vx * vx + vy * vy
-            if seg_len2 <= 1e-9:
-                continue
-            t = ((px - x0) * vx + (py - y0) * vy) / seg_len2
-            t = max(0.0, min(1.0, t))
-            proj_x = x0 + t * vx
-            proj_y = y0 + t * vy
-            d2 = (proj_x - px) ** 2 + (proj_y - py) ** 2
-            if d2 < best_d2:
-                best_d2 = d2
-                best = (proj_x, proj_y, i, t)
-        if best is None:
+        starts, v, seg_len2 = self._fault_segments()
+        if not np.isfinite(seg_len2).any():
             return lat, lon
-        proj_x, proj_y, idx, t = best
-        lat_proj, lon_proj = xy_km_to_latlon(proj_x, proj_y)
+        p = np.array(latlon_to_xy_km(lat, lon))
+        # 各线段上的投影参数 t∈[0,1]（退化线段 t=0，并在下面以 inf 距离排除）
+        t = np.clip(((p - starts) * v).sum(axis=1) / seg_len2, 0.0, 1.0)
+        proj = starts + t[:, None] * v
+        d2 = ((proj - p) ** 2).sum(axis=1)
+        d2[~np.isfinite(seg_len2)] = np.inf
+        proj_x, proj_y = proj[int(np.argmin(d2))]
+        lat_proj, lon_proj = xy_km_to_latlon(float(proj_x), float(proj_y))
         return lat_proj, lon_proj
 
     def start_multi_simulation(self):
@@ -449,6 +803,57 @@ class EarthquakeSimulator:
         self.station_flash_animations.clear()  # 清空站点闪烁动画
         self.intensity_flash_counts = {}  # 重置闪烁次数计数
 
+    def _set_station_hits(self, idx: np.ndarray, intensities: np.ndarray, is_s_wave: np.ndarray):
+        """记录本帧有震度的站点（SoA：站点下标 / 震度 / 是否S波，按站点顺序），
+        并生成 station_intensities 字典视图供按坐标查询的旧代码使用"""
+        self.st_hit_idx = idx
+        self.st_hit_intensity = intensities
+        self.st_hit_is_s = is_s_wave
+        keys = self.st_keys
+        self.station_intensities = {
+            keys[i]: (intensity, is_s)
+            for i, intensity, is_s in zip(idx.tolist(), intensities.tolist(), is_s_wave.tolist())
+        }
+
+    def _clear_station_hits(self):
+        self._set_station_hits(
+            np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64), np.empty(0, dtype=bool)
+        )
+        self._single_radii = None  # 命中结果已清空，下一帧必须重新计算
+
+    def _single_station_terms(self):
+        """单震源下各站点与时间无关的量，按震源参数缓存
+
+        返回 (按距离排序的震央距离, 排序下标, S波震度, P波震度)；震度按站点原顺序
+        """
+        eq = self.earthquake
+        key = (id(eq), eq.lat, eq.lon, eq.depth, eq.magnitude)
+        if getattr(self, "_single_terms_key", None) != key:
+            ex, ey = latlon_to_xy_km(eq.lat, eq.lon)
+            epicentral_dist = np.hypot(self.st_x_km - ex, self.st_y_km - ey)
+            # 计算S波实际震度
+            s_intensity = calc_jma_intensity_batch(eq.magnitude, eq.depth, epicentral_dist, bai=self.st_bai)
+            # P波震度计算 (Scratch公式: S波震度 / 1.5 - 0.5)
+            p_intensity = s_intensity / 1.5 - 0.5
+            order = np.argsort(epicentral_dist, kind="stable")
+            self._single_terms = (epicentral_dist[order], order, s_intensity, p_intensity)
+            self._single_terms_key = key
+            self._single_radii = None
+        return self._single_terms
+
+    def _trigger_station_alert(self):
+        """站点首次超过已触发的最大震度（且>=3）时添加白圈提示，取站点顺序中的第一个"""
+        candidates = np.flatnonzero(
+            (self.st_hit_intensity >= 3.0) & (self.st_hit_intensity > self.max_triggered_intensity)
+        )
+        if candidates.size == 0:
+            return
+        k = int(candidates[0])
+        intensity = float(self.st_hit_intensity[k])
+        lat, lon = self.st_keys[int(self.st_hit_idx[k])]
+        self.max_triggered_intensity = intensity
+        self.alert_animations.append((lat, lon, self._current_time_value(), intensity_to_scale(intensity)))
+
     def calculate_station_intensities(self):
         """派发单/多震源计算。"""
         if self.sim_mode == "multi":
@@ -467,101 +872,92 @@ class EarthquakeSimulator:
         # 获取当前波的震央距离半径
         p_radius = self.earthquake.get_p_wave_radius()
         s_radius = self.earthquake.get_s_wave_radius()
-        self.station_intensities = {}  # (lat,lon) -> (intensity, is_s_wave)
         # region_max_intensities 由 update_region_intensities_from_new_stations() 独立管理
 
-        for station in self.stations:
-            lat = float(station['lat'])
-            lon = float(station['lon'])
-            amp = float(station.get('amp', 1.0))  # 站点放大系数
-
-            # 使用震央距离判断波是否到达
-            epicentral_dist = self.earthquake.get_epicentral_distance(lat, lon)
-
-            # 计算S波实际震度（Scratch 兼容：场地系数 amp 先变换成 bai 再参与计算）
-            bai = (amp * 4 + amp * amp) / 5.0
-            s_intensity = calc_jma_intensity(
-                self.earthquake.magnitude,
-                self.earthquake.depth,
-                epicentral_dist,
-                bai=bai,
-            )
-            # P波震度计算 (Scratch公式: S波震度 / 1.5 - 0.5)
-            p_intensity = s_intensity / 1.5 - 0.5
-
-            if epicentral_dist <= s_radius and s_intensity >= 0.5:
-                self.station_intensities[(lat, lon)] = (s_intensity, True)
-            elif epicentral_dist <= p_radius and p_intensity >= 0.5:
-                self.station_intensities[(lat, lon)] = (p_intensity, False)
+        # 震度只取决于震源参数，按震源缓存；半径不变（如暂停）时命中结果也不变
+        sorted_dist, order, s_intensity, p_intensity = self._single_station_terms()
+        radii = (p_radius, s_radius)
+        if radii == self._single_radii:
+            return
+        self._single_radii = radii
+
+        # 波已到达的站点是按距离排序后的前缀：S波圈内 order[:n_s]，只有P波到达的 order[n_s:n_p]
+        n_s = np.searchsorted(sorted_dist, s_radius, side="right")
+        n_p = max(n_s, np.searchsorted(sorted_dist, p_radius, side="right"))
+        s_idx = order[:n_s]
+        s_idx = s_idx[s_intensity[s_idx] >= 0.5]
+        p_idx = order[n_s:n_p]
+        p_idx = p_idx[p_intensity[p_idx] >= 0.5]
+
+        # 只记录命中的站点（S波优先于P波），按站点顺序
+        s_hit = np.zeros(len(s_intensity), dtype=bool)
+        s_hit[s_idx] = True
+        hit = np.sort(np.concatenate((s_idx, p_idx)))
+        is_s = s_hit[hit]
+        self._set_station_hits(hit, np.where(is_s, s_intensity[hit], p_intensity[hit]), is_s)
 
     def calculate_station_intensities_multi(self):
         """多震源震度聚合：取最大值。"""
         if not self.multi_manager:
             return
-        self.station_intensities = {}
         self.region_max_intensities = {}
         self.max_intensity = 0
         self.max_intensity_location = ""
 
-        for station in self.stations:
-            lat = float(station['lat'])
-            lon = float(station['lon'])
-            area_code = station['area']['code']
-            area_name = station['area']['name']
-            amp = float(station.get('amp', 1.0))
+        intensities, is_s_waves = self.multi_manager.calc_intensity_batch(
+            self.st_x_km, self.st_y_km, self.st_bai
+        )
+        hit = np.flatnonzero(intensities >= 0.5)
+        self._set_station_hits(hit, intensities[hit], is_s_waves[hit])
 
-            intensity, is_s_wave = self.multi_manager.calc_intensity(lat, lon, amp=amp)
-            if intensity < 0.5:
-                continue
+        if hit.size:
+            # 按区域取最大震度
+            region_max = np.zeros(len(self.st_area_codes))
+            np.maximum.at(region_max, self.st_area_idx[hit], intensities[hit])
+            for k in np.flatnonzero(region_max > 0):
+                self.region_max_intensities[str(self.st_area_codes[k])] = float(region_max[k])
 
-            self.station_intensities[(lat, lon)] = (intensity, is_s_wave)
-            if area_code not in self.region_max_intensities or intensity > self.region_max_intensities[area_code]:
-                self.region_max_intensities[area_code] = intensity
-            if intensity > self.max_intensity:
-                self.max_intensity = intensity
-                self.max_intensity_location = area_name
+            # 最大震度站点（同值时取第一个，与逐站比较一致）
+            top = hit[np.argmax(intensities[hit])]
+            self.max_intensity = float(intensities[top])
+            self.max_intensity_location = self.stations[top]['area']['name']
 
         # 使用新的音频管理器播报震度（带冷却机制，避免频繁播报）
         # 新版本统一处理震度3-7的播报，替换了旧的震度4和震度7单独播放逻辑
         if self.sound_manager and self.max_intensity >= 3.0:
             self.sound_manager.announce_with_cooldown(self.max_intensity, cooldown_seconds=3.0)
 
-        for (lat, lon), (intensity, is_s_wave) in self.station_intensities.items():
-            if intensity >= 3.0 and intensity > self.max_triggered_intensity:
-                scale = intensity_to_scale(intensity)
-                self.max_triggered_intensity = intensity
-                self.alert_animations.append((lat, lon, self._current_time_value(), scale))
-                break
+        self._trigger_station_alert()
 
     def draw_stations(self):
         """绘制站点模式 - 使用s1-s9图标"""
         # 图标缩放因子：限制在0.02-0.41之间
         icon_scale = min(0.41, max(0.02, 0.1 * self.zoom_level))
 
-        for station in self.stations:
-            lat = float(station['lat'])
-            lon = float(station['lon'])
-            data = self.station_intensities.get((lat, lon))
-            if not data:
-                continue
-
-            intensity, is_s_wave = data
-            x, y = self.latlon_to_screen(lat, lon)
+        if self.st_hit_idx.size == 0:
+            return
 
-            # 震度转图标索引
-            icon_idx = intensity_to_scale(intensity)
-            idx_map = {'1':1, '2':2, '3':3, '4':4, '5-':5, '5+':6, '6-':7, '6+':8, '7':9}
-            idx = idx_map.get(icon_idx, 1)
+        # 只遍历有震度且在视口内的站点
+        points = self.km_to_screen_batch(self.st_x_km[self.st_hit_idx], self.st_y_km[self.st_hit_idx])
+        on_screen = (
+            (points[:, 0] >= -_ICON_CULL_MARGIN) & (points[:, 0] <= WINDOW_WIDTH + _ICON_CULL_MARGIN)
+            & (points[:, 1] >= -_ICON_CULL_MARGIN) & (points[:, 1] <= WINDOW_HEIGHT + _ICON_CULL_MARGIN)
+        )
 
+        # 图标收集后一次 blits 提交
+        icon_blits = []
+        for (x, y), intensity in zip(points[on_screen].tolist(), self.st_hit_intensity[on_screen].tolist()):
+            # 震度转图标索引（震度0也用1号图标）
+            idx = intensity_to_scale_index(intensity) or 1
             if idx in self.station_icons:
                 icon = scale_icon(self.station_icons[idx], icon_scale)
-                rect = icon.get_rect(center=(x, y))
-                self.screen.blit(icon, rect)
+                icon_blits.append((icon, icon.get_rect(center=(x, y))))
             else:
                 r = max(3, int(10 * icon_scale))
                 color = get_intensity_color(intensity)
                 pygame.draw.circle(self.screen, color, (x, y), r)
                 pygame.draw.circle(self.screen, (0, 0, 0), (x, y), r, 1)
+        self.screen.blits(icon_blits, doreturn=False)
 
     def draw_regions_with_intensity(self, fill_only=False, icons_only=False):
         """绘制带震度的区域 - 使用t1-t9图标 + 区域填色
@@ -577,96 +973,89 @@ class EarthquakeSimulator:
         # 性能优化：按震度分组多边形，每个震度只创建一个Surface
         intensity_polygons = {}  # intensity_idx -> [(points, ...), ...]
 
-        for region in self.regions_data:
-            props = region.get('properties', {})
-            code = props.get('code', '')
-            geom = region.get('geometry', {})
-            coords = geom.get('coordinates', [])
-            geom_type = geom.get('type', '')
+        # 区域中心与填充多边形的屏幕坐标按视图缓存（平移/缩放后失效）
+        self._view_km_params()
+        if self._region_label_cache_key != self._view_cache_key:
+            self._region_label_cache_key = self._view_cache_key
+            self._region_label_cache = {}
+            self._region_screen_cache = {}
 
-            intensity = self.region_max_intensities.get(code, 0)
+        # 视口外的区域不投影填充多边形
+        visible_rings = set() if icons_only else set(self._visible_rings(self.region_bboxes).tolist())
+        centroid_points = None  # 仅在有区域中心未缓存时才批量投影全部中心点
 
-            if geom_type == 'Polygon':
-                polys = [coords[0]]
-            elif geom_type == 'MultiPolygon':
-                polys = [c[0] for c in coords]
-            else:
+        # 只遍历有震度的区域
+        for code, intensity in self.region_max_intensities.items():
+            if intensity < 1:
+                continue
+            features = self.region_features_by_code.get(code)
+            if not features:
                 continue
 
+            # 收集区域中心用于绘制图标（在非 fill_only 模式下）
+            if not fill_only:
+                centers = self._region_label_cache.get(code)
+                if centers is None:
+                    if centroid_points is None:
+                        centroid_points = self.km_to_screen_batch(
+                            self.region_centroids_km[:, 0], self.region_centroids_km[:, 1]
+                        ).tolist()
+                    centers = [centroid_points[ring_idx] for ring_idx, _, _ in features]
+                    self._region_label_cache[code] = centers
+                for cx, cy in centers:
+                    # 视口外的标签不绘制
+                    if (-_ICON_CULL_MARGIN <= cx <= WINDOW_WIDTH + _ICON_CULL_MARGIN
+                            and -_ICON_CULL_MARGIN <= cy <= WINDOW_HEIGHT + _ICON_CULL_MARGIN):
+                        region_labels.append((cx, cy, intensity))
+
             # 收集区域填充多边形（按震度分组）
-            if not icons_only and intensity >= 1:
-                # 计算震度索引（用于分组）
-                if intensity < 1.5:
-                    idx = 1
-                elif intensity < 2.5:
-                    idx = 2
-                elif intensity < 3.5:
-                    idx = 3
-                elif intensity < 4.5:
-                    idx = 4
-                elif intensity < 5.0:
-                    idx = 5
-                elif intensity < 5.5:
-                    idx = 6
-                elif intensity < 6.0:
-                    idx = 7
-                elif intensity < 6.5:
-                    idx = 8
-                else:
-                    idx = 9
+            if not icons_only:
+                # 计算震度索引（用于分组；此处震度>=1，下标为1-9）
+                idx = intensity_to_scale_index(intensity)
 
                 if idx not in intensity_polygons:
                     intensity_polygons[idx] = []
 
-                for poly in polys:
-                    points = []
-                    for lon, lat in poly:
-                        x, y = self.latlon_to_screen(lat, lon)
-                        points.append((int(x), int(y)))
-                    if len(points) >= 3:
-                        intensity_polygons[idx].append(points)
-
-            # 收集区域中心用于绘制图标（在非 fill_only 模式下，且震度 >= 1）
-            if not fill_only and intensity >= 1:
-                all_lons = []
-                all_lats = []
-                for poly in polys:
-                    for lon, lat in poly:
-                        all_lons.append(lon)
-                        all_lats.append(lat)
-                if all_lons:
-                    cx, cy = self.latlon_to_screen(sum(all_lats)/len(all_lats), sum(all_lons)/len(all_lons))
-                    region_labels.append((cx, cy, intensity))
-
-        # 按震度从低到高绘制填充（每个震度只创建一个Surface）
+                for ring_idx, _, _ in features:
+                    if ring_idx not in visible_rings:
+                        continue
+                    rings = self._region_screen_cache.get(ring_idx)
+                    if rings is None:
+                        rings = self.rings_to_screen(*self.region_rings[ring_idx])
+                        self._region_screen_cache[ring_idx] = rings
+                    intensity_polygons[idx].extend(rings)
+
+        # 按震度从低到高把填充画到常驻的半透明图层上（区域互不重叠，可共用一层），
+        # 只 blit 实际画到的范围，blit 后把该范围清回透明供下一帧使用
         if not icons_only and intensity_polygons:
+            overlay = self._region_overlay
+            dirty = None
             for idx in sorted(intensity_polygons.keys()):
                 color = self._get_region_fill_color_by_idx(idx)
-                if color and intensity_polygons[idx]:
-                    # 创建一个共享的临时Surface
-                    temp_surface = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
-                    # 绘制该震度的所有多边形
-                    for points in intensity_polygons[idx]:
-                        pygame.draw.polygon(temp_surface, color, points)
-                    # 一次性blit到屏幕
-                    self.screen.blit(temp_surface, (0, 0))
+                if not color:
+                    continue
+                for points in intensity_polygons[idx]:
+                    rect = pygame.draw.polygon(overlay, color, points)
+                    dirty = rect if dirty is None else dirty.union(rect)
+            if dirty is not None:
+                self.screen.blit(overlay, dirty.topleft, dirty)
+                overlay.fill((0, 0, 0, 0), dirty)
 
         # 绘制区域震度标签
         if not fill_only:
+            icon_blits = []  # 图标收集后一次 blits 提交
             for cx, cy, intensity in region_labels:
-                icon_idx = intensity_to_scale(intensity)
-                idx_map = {'1':1, '2':2, '3':3, '4':4, '5-':5, '5+':6, '6-':7, '6+':8, '7':9}
-                idx = idx_map.get(icon_idx, 1)
+                idx = intensity_to_scale_index(intensity) or 1
 
                 if idx in self.region_icons:
                     icon = scale_icon(self.region_icons[idx], icon_scale)
-                    rect = icon.get_rect(center=(cx, cy))
-                    self.screen.blit(icon, rect)
+                    icon_blits.append((icon, icon.get_rect(center=(cx, cy))))
                 else:
                     s = max(6, int(20 * icon_scale))
                     color = get_intensity_color(intensity)
                     pygame.draw.rect(self.screen, color, (cx-s//2, cy-s//2, s, s))
                     pygame.draw.rect(self.screen, (0, 0, 0), (cx-s//2, cy-s//2, s, s), 1)
+            self.screen.blits(icon_blits, doreturn=False)
 
     def _get_region_fill_color(self, intensity: float):
         """根据震度获取区域填充颜色（与 intensity_to_scale 阈值一致）"""
@@ -713,17 +1102,14 @@ class EarthquakeSimulator:
             print("[性能优化] 预计算站点->区域映射（point-in-polygon）...")
             self._station_to_region_map = {}  # station.id -> (region_code, region_name)
 
-            for station in self.station_manager.stations:
-                # 使用point-in-polygon判断站点在哪个区域
-                region_code = self._find_region_for_point(station.lat, station.lon)
+            stations = self.station_manager.stations
+            codes = self._find_regions_for_points(
+                np.array([st.lat for st in stations], dtype=np.float64),
+                np.array([st.lon for st in stations], dtype=np.float64),
+            )
+            for station, region_code in zip(stations, codes):
                 if region_code:
-                    # 找到区域名称
-                    region_name = ""
-                    for region in self.regions_data:
-                        if region.get('properties', {}).get('code', '') == region_code:
-                            region_name = region.get('properties', {}).get('name', '')
-                            break
-                    self._station_to_region_map[station.id] = (region_code, region_name)
+                    self._station_to_region_map[station.id] = (region_code, self.region_names.get(region_code, ""))
 
             print(f"[性能优化] 完成: {len(self._station_to_region_map)}/{len(self.station_manager.stations)} 个站点在陆地区域内")
 
@@ -753,81 +1139,89 @@ class EarthquakeSimulator:
                 self.max_intensity = station.intensity
                 self.max_intensity_location = region_name
 
-    def _find_region_for_point(self, lat: float, lon: float) -> str:
-        """查找点所在的区域代码（使用point-in-polygon算法）"""
-        for region in self.regions_data:
-            props = region.get('properties', {})
-            code = props.get('code', '')
-            geom = region.get('geometry', {})
-            coords = geom.get('coordinates', [])
-            geom_type = geom.get('type', '')
-
-            if geom_type == 'Polygon':
-                polys = [coords[0]]
-            elif geom_type == 'MultiPolygon':
-                polys = [c[0] for c in coords]
-            else:
+    def _find_regions_for_points(self, lats: np.ndarray, lons: np.ndarray) -> list:
+        """批量查找各点所在的区域代码（射线法，按区域顺序取第一个命中的区域，未命中为空串）"""
+        codes = [""] * len(lats)
+        unassigned = np.ones(len(lats), dtype=bool)
+        for (lonlat, offsets), code in zip(self.region_rings_lonlat, self.region_ring_codes):
+            # 先用经纬度包围盒筛掉绝大多数点
+            lon_min, lat_min = lonlat.min(axis=0)
+            lon_max, lat_max = lonlat.max(axis=0)
+            cand = np.flatnonzero(
+                unassigned
+                & (lons >= lon_min) & (lons <= lon_max)
+                & (lats >= lat_min) & (lats <= lat_max)
+            )
+            if cand.size == 0:
                 continue
+            inside = np.zeros(cand.size, dtype=bool)
+            for j in range(len(offsets) - 1):
+                inside |= self._points_in_ring(lats[cand], lons[cand], lonlat[offsets[j]:offsets[j + 1]])
+            for i in cand[inside].tolist():
+                codes[i] = code
+            unassigned[cand[inside]] = False
+        return codes
+
+    @staticmethod
+    def _points_in_ring(lats: np.ndarray, lons: np.ndarray, ring: np.ndarray) -> np.ndarray:
+        """射线法判断多个点是否在单个外环内（ring 为 (K,2) 的 lon/lat 数组），点×边一次广播完成"""
+        p1_lon, p1_lat = ring[:, 0], ring[:, 1]
+        p2 = np.roll(ring, -1, axis=0)
+        p2_lon, p2_lat = p2[:, 0], p2[:, 1]
+
+        lat = lats[:, None]
+        lon = lons[:, None]
+        crosses = (
+            (lat > np.minimum(p1_lat, p2_lat))
+            & (lat <= np.maximum(p1_lat, p2_lat))
+            & (lon <= np.maximum(p1_lon, p2_lon))
+        )
+        # 水平边不会满足上面的纬度条件，这里的除零结果会被掩掉
+        with np.errstate(divide='ignore', invalid='ignore'):
+            xinters = (lat - p1_lat) * (p2_lon - p1_lon) / (p2_lat - p1_lat) + p1_lon
+        crosses &= (p1_lon == p2_lon) | (lon <= xinters)
+        return (np.count_nonzero(crosses, axis=1) % 2) == 1
 
-            # 检查点是否在任一多边形内
-            for poly in polys:
-                if self._point_in_polygon(lat, lon, poly):
-                    return code
-
-        return ""
-
-    def _point_in_polygon(self, lat: float, lon: float, polygon: list) -> bool:
-        """射线法判断点是否在多边形内"""
-        n = len(polygon)
-        inside = False
-
-        p1_lon, p1_lat = polygon[0]
-        for i in range(1, n + 1):
-            p2_lon, p2_lat = polygon[i % n]
-
-            if lat > min(p1_lat, p2_lat):
-                if lat <= max(p1_lat, p2_lat):
-                    if lon <= max(p1_lon, p2_lon):
-                        if p1_lat != p2_lat:
-                            xinters = (lat - p1_lat) * (p2_lon - p1_lon) / (p2_lat - p1_lat) + p1_lon
-                        if p1_lon == p2_lon or lon <= xinters:
-                            inside = not inside
-
-            p1_lon, p1_lat = p2_lon, p2_lat
+    def _multi_wave_screen_circles(self) -> list:
+        """已激活震源的波前屏幕参数 [(cx, cy, p_px, s_px), ...]，顺序与 multi_manager.sources 中的已激活震源一致
 
-        return inside
+        圆心一次批量投影、半径一次批量换算成像素，代替逐震源 latlon_to_screen
+        """
+        circles = self.multi_manager.get_wave_circles()
+        if not circles:
+            return []
+        _, _, _, _, pixels_per_km, _, _ = self._view_km_params()
+        centers = self.latlons_to_screen([c["lat"] for c in circles], [c["lon"] for c in circles]).tolist()
+        radii = (np.array([(c["p_radius"], c["s_radius"]) for c in circles]) * pixels_per_km).astype(np.int64).tolist()
+        return [(cx, cy, p_px, s_px) for (cx, cy), (p_px, s_px) in zip(centers, radii)]
 
     def draw_wave_circles(self):
         """绘制地震波圆和震央标记（支持双重显示）"""
         if self.sim_mode == "multi":
             if not self.multi_manager:
                 return
-            _, _, _, _, pixels_per_km, _, _ = self._view_km_params()
             s_color = get_shindo_color(self.max_intensity) if self.max_intensity >= 0.5 else (128, 128, 128)
+            circles = self._multi_wave_screen_circles()
 
-            # 绘制波前（不使用円.svg，只用pygame.draw.circle）
-            for circle in self.multi_manager.get_wave_circles():
-                cx, cy = self.latlon_to_screen(circle["lat"], circle["lon"])
-                p_px = int(circle["p_radius"] * pixels_per_km)
-                s_px = int(circle["s_radius"] * pixels_per_km)
+            # 绘制波前（不使用円.svg，只画圆环）
+            for cx, cy, p_px, s_px in circles:
                 if p_px > 0 and p_px < WINDOW_WIDTH * 3:
-                    pygame.draw.circle(self.screen, (0, 150, 255), (cx, cy), p_px, 2)
+                    draw_ring(self.screen, (0, 150, 255), (cx, cy), p_px, 2)
                 if s_px > 0 and s_px < WINDOW_WIDTH * 3:
-                    pygame.draw.circle(self.screen, s_color, (cx, cy), s_px, 3)
+                    draw_ring(self.screen, s_color, (cx, cy), s_px, 3)
 
             # 绘制已激活的震源点（使用震央图标）
+            # 只显示已激活的震源，圆心与波前共用
             icon_scale = min(0.8, max(0.2, 0.15 * self.zoom_level))
-            for src in self.multi_manager.sources:
-                if src.active:  # 只显示已激活的震源
-                    ex, ey = self.latlon_to_screen(src.lat, src.lon)
-                    if self.epicenter_icon:
-                        icon = scale_icon(self.epicenter_icon, icon_scale)
-                        rect = icon.get_rect(center=(ex, ey))
-                        self.screen.blit(icon, rect)
-                    else:
-                        s = max(8, int(15 * icon_scale))
-                        pygame.draw.line(self.screen, (255, 0, 0), (ex-s, ey), (ex+s, ey), 3)
-                        pygame.draw.line(self.screen, (255, 0, 0), (ex, ey-s), (ex, ey+s), 3)
+            for ex, ey, _, _ in circles:
+                if self.epicenter_icon:
+                    icon = scale_icon(self.epicenter_icon, icon_scale)
+                    rect = icon.get_rect(center=(ex, ey))
+                    self.screen.blit(icon, rect)
+                else:
+                    s = max(8, int(15 * icon_scale))
+                    pygame.draw.line(self.screen, (255, 0, 0), (ex-s, ey), (ex+s, ey), 3)
+                    pygame.draw.line(self.screen, (255, 0, 0), (ex, ey-s), (ex, ey+s), 3)
             return
 
         if not self.earthquake:
@@ -843,7 +1237,7 @@ class EarthquakeSimulator:
 
         # 绘制追标波形（只有在站点检测到地震波后才显示）
         if (self.show_tracking_waves and self.tracking_wave_visible and
-            self.eew_tracker and self.eew_tracker.enabled):
+            self.eew_tracker.enabled):
             tracking_lat, tracking_lon, tracking_depth, tracking_mag = self.eew_tracker.get_current_values()
 
             # 创建临时地震对象用于绘制追标波形
@@ -903,7 +1297,7 @@ class EarthquakeSimulator:
         p_radius_km = earthquake_obj.get_p_wave_radius()
         p_radius_px = int(p_radius_km * pixels_per_km)
         if p_radius_px > 0 and p_radius_px < WINDOW_WIDTH * 3:
-            pygame.draw.circle(self.screen, p_color, (ex, ey), p_radius_px, 2)
+            draw_ring(self.screen, p_color, (ex, ey), p_radius_px, 2)
 
         # S波
         s_radius_km = earthquake_obj.get_s_wave_radius()
@@ -929,16 +1323,10 @@ class EarthquakeSimulator:
 
         # S波圆圈（追标波形不显示円.svg图标）
         if current_time >= s_arrival_time and s_radius_px > 0 and s_radius_px < WINDOW_WIDTH * 3:
-            pygame.draw.circle(self.screen, s_color_base, (ex, ey), s_radius_px, 3)
+            draw_ring(self.screen, s_color_base, (ex, ey), s_radius_px, 3)
             # 只有真实波形才显示円.svg图标
             if suffix == "真实" and self.s_wave_icon and s_radius_px > 10:
-                icon_size = s_radius_px * 2
-                icon = pygame.transform.smoothscale(self.s_wave_icon, (icon_size, icon_size))
-                tinted = icon.copy()
-                tinted.fill(s_color_base + (0,), special_flags=pygame.BLEND_RGB_MULT)
-                tinted.set_alpha(80)
-                rect = tinted.get_rect(center=(ex, ey))
-                self.screen.blit(tinted, rect)
+                blit_s_wave_overlay(self.screen, self.s_wave_icon, (ex, ey), s_radius_px, s_color_base)
 
         # 绘制震央标记（追标波形使用相同的红色震央图标，不改变颜色）
         icon_scale = min(0.8, max(0.2, 0.15 * self.zoom_level))
@@ -962,13 +1350,13 @@ class EarthquakeSimulator:
 
         current_time = self._current_time_value()
         duration = 0.8  # 动画持续时间（秒）
-        to_remove = []
+        project = self._make_project_func()
+
+        # 先一趟过滤掉已结束的动画（原地替换内容），再绘制剩余的
+        self.alert_animations[:] = [a for a in self.alert_animations if current_time - a[2] <= duration]
 
-        for i, (lat, lon, start_time, scale) in enumerate(self.alert_animations):
+        for lat, lon, start_time, scale in self.alert_animations:
             elapsed = current_time - start_time
-            if elapsed > duration:
-                to_remove.append(i)
-                continue
 
             # 计算动画进度（0到1）
             progress = elapsed / duration
@@ -980,16 +1368,16 @@ class EarthquakeSimulator:
             alpha = int(255 * (1 - progress))
 
             # 转换为屏幕坐标
-            x, y = self.latlon_to_screen(lat, lon)
+            x, y = project(lat, lon)
 
-            # 绘制白色圆圈（使用临时surface实现透明度）
-            temp_surface = pygame.Surface((radius * 2 + 4, radius * 2 + 4), pygame.SRCALPHA)
-            pygame.draw.circle(temp_surface, (255, 255, 255, alpha), (radius + 2, radius + 2), radius, 3)
-            self.screen.blit(temp_surface, (x - radius - 2, y - radius - 2))
-
-        # 清理已完成的动画
-        for i in reversed(to_remove):
-            self.alert_animations.pop(i)
+            # 绘制白色圆圈：复用该半径的预渲染圆环，整体透明度用 set_alpha 调制
+            sprite = self._alert_ring_sprites.get(radius)
+            if sprite is None:
+                sprite = pygame.Surface((radius * 2 + 4, radius * 2 + 4), pygame.SRCALPHA).convert_alpha()
+                pygame.draw.circle(sprite, (255, 255, 255, 255), (radius + 2, radius + 2), radius, 3)
+                self._alert_ring_sprites[radius] = sprite
+            sprite.set_alpha(alpha)
+            self.screen.blit(sprite, (x - radius - 2, y - radius - 2))
 
     def draw_station_flash_effects(self):
         """绘制站点首次达到震度3+时的彩色闪烁效果
@@ -1006,13 +1394,13 @@ class EarthquakeSimulator:
 
         current_time = self._current_time_value()
         duration = 0.5  # 动画持续时间（秒）
-        to_remove = []
+        project = self._make_project_func()
+
+        # 先一趟过滤掉已结束的动画（原地替换内容），再绘制剩余的
+        self.station_flash_animations[:] = [a for a in self.station_flash_animations if current_time - a[2] <= duration]
 
-        for i, (lat, lon, start_time, intensity) in enumerate(self.station_flash_animations):
+        for lat, lon, start_time, intensity in self.station_flash_animations:
             elapsed = current_time - start_time
-            if elapsed > duration:
-                to_remove.append(i)
-                continue
 
             # 计算动画进度（0到1）
             progress = elapsed / duration
@@ -1030,16 +1418,25 @@ class EarthquakeSimulator:
             color = get_shindo_color(intensity)
 
             # 转换为屏幕坐标
-            x, y = self.latlon_to_screen(lat, lon)
-
-            # 绘制实心圆圈（无边框）
-            temp_surface = pygame.Surface((radius * 2 + 4, radius * 2 + 4), pygame.SRCALPHA)
-            pygame.draw.circle(temp_surface, color + (alpha,), (radius + 2, radius + 2), radius)
-            self.screen.blit(temp_surface, (x - radius - 2, y - radius - 2))
-
-        # 清理已完成的动画
-        for i in reversed(to_remove):
-            self.station_flash_animations.pop(i)
+            x, y = project(lat, lon)
+
+            # 绘制实心圆圈（无边框）：每种颜色只渲染一次，透明度用 set_alpha 调制
+            sprite = self._flash_sprites.get(color)
+            if sprite is None:
+                sprite = pygame.Surface((radius * 2 + 4, radius * 2 + 4), pygame.SRCALPHA).convert_alpha()
+                pygame.draw.circle(sprite, color + (255,), (radius + 2, radius + 2), radius)
+                self._flash_sprites[color] = sprite
+            sprite.set_alpha(alpha)
+            self.screen.blit(sprite, (x - radius - 2, y - radius - 2))
+
+    def _hud_text(self, name: str, key, template: str, *args) -> str:
+        """按 key 缓存格式化后的 HUD 字符串；key（即显示精度下的输入值）不变时直接复用"""
+        cached = self._hud_strings.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        text = template.format(*args)
+        self._hud_strings[name] = (key, text)
+        return text
 
     def draw_earthquake_info(self):
         """绘制地震速报风格信息（左上角）- 使用震度图标"""
@@ -1073,8 +1470,7 @@ class EarthquakeSimulator:
         color = get_intensity_color(self.max_intensity)
 
         # 震度转图标索引
-        idx_map = {'0':0, '1':1, '2':2, '3':3, '4':4, '5-':5, '5+':6, '6-':7, '6+':8, '7':9}
-        idx = idx_map.get(scale, 0)
+        idx = intensity_to_scale_index(self.max_intensity)
 
         # 计算面板高度（根据是否显示长周期）
         panel_height = 180
@@ -1085,6 +1481,7 @@ class EarthquakeSimulator:
         pygame.draw.rect(self.screen, (0, 0, 0), (10, 10, 360, panel_height))
         pygame.draw.rect(self.screen, color, (10, 10, 360, panel_height), 3)
 
+        hud = []  # (Surface, 位置)，最后一次性 blits
         y = 15
         # 緊急地震速報 标题：根据震度显示"予報"或"警報"
         # 震度5弱(5.0)以上显示"警報"，否则显示"予報"
@@ -1099,60 +1496,78 @@ class EarthquakeSimulator:
         else:
             eew_title = "緊急地震速報(予報)"
             title_color = (255, 200, 100)  # 橙黄色
-        surf = self.font_cn_small.render(eew_title, True, title_color)
-        self.screen.blit(surf, (20, y))
+        surf = render_text(self.font_cn_small, eew_title, title_color)
+        hud.append((surf, (20, y)))
         y += 22
 
-        surf = self.font_cn.render(f"最大震度", True, (255, 255, 255))
-        self.screen.blit(surf, (20, y))
+        surf = render_text(self.font_cn, f"最大震度", (255, 255, 255))
+        hud.append((surf, (20, y)))
 
         # 使用震度图标 - 放在文字右边，缩小显示
         if idx in self.shindo_icons:
             icon = scale_icon(self.shindo_icons[idx], 0.6)
-            self.screen.blit(icon, (260, y - 5))
+            hud.append((icon, (260, y - 5)))
         else:
-            surf = self.font_cn_large.render(f"{scale}", True, color)
-            self.screen.blit(surf, (260, y - 5))
+            surf = render_text(self.font_cn_large, f"{scale}", color)
+            hud.append((surf, (260, y - 5)))
         y += 50
 
         # 最大震度所在地
         if hasattr(self, 'max_intensity_location') and self.max_intensity_location:
-            surf = self.font_cn_small.render(f"({self.max_intensity_location})", True, (200, 200, 200))
-            self.screen.blit(surf, (20, y))
+            surf = render_text(self.font_cn_small, f"({self.max_intensity_location})", (200, 200, 200))
+            hud.append((surf, (20, y)))
             y += 20
 
         # 震央
-        location = self.locator.get_location_name(ref_lon, ref_lat, 'ja')
-        surf = self.font_cn.render(f" {location}", True, (255, 255, 255))
-        self.screen.blit(surf, (20, y))
+        location = self.location_name(ref_lat, ref_lon, 'ja')
+        surf = render_text(self.font_cn, f" {location}", (255, 255, 255))
+        hud.append((surf, (20, y)))
         y += 25
 
-        surf = self.font_cn.render(f"M{ref_mag:.1f} {int(ref_depth)}km", True, (255, 255, 255))
-        self.screen.blit(surf, (20, y))
+        surf = render_text(
+            self.font_cn,
+            self._hud_text("mag_depth", (ref_mag, ref_depth), "M{:.1f} {}km", ref_mag, int(ref_depth)),
+            (255, 255, 255),
+        )
+        hud.append((surf, (20, y)))
         y += 25
 
         # 多震源模式：显示已激活震源数量
         if self.sim_mode == "multi" and self.multi_manager:
             active_count = sum(1 for src in self.multi_manager.sources if src.active)
             total_count = len(self.multi_manager.sources)
-            surf = self.font_cn_small.render(f"已激活: {active_count}/{total_count} 震源", True, (200, 200, 200))
-            self.screen.blit(surf, (20, y))
+            surf = render_text(
+                self.font_cn_small,
+                self._hud_text("active", (active_count, total_count), "已激活: {}/{} 震源", active_count, total_count),
+                (200, 200, 200),
+            )
+            hud.append((surf, (20, y)))
             y += 20
 
-        surf = self.font_cn_small.render(f"経過: {elapsed_time:.1f}秒", True, (200, 200, 200))
-        self.screen.blit(surf, (20, y))
+        # 经过时间只显示到0.1秒：按显示精度取键，同一0.1秒内复用字符串
+        elapsed_tenth = round(elapsed_time, 1)
+        surf = render_text(
+            self.font_cn_small,
+            self._hud_text("elapsed", elapsed_tenth, "経過: {:.1f}秒", elapsed_tenth),
+            (200, 200, 200),
+        )
+        hud.append((surf, (20, y)))
 
         # 显示EEW追标状态
-        if self.sim_mode == "single" and self.eew_tracker and self.eew_tracker.enabled:
+        if self.sim_mode == "single" and self.eew_tracker.enabled:
             y += 20
             if self.eew_tracker.is_tracking_complete():
-                status_text = f"訂正完了 ({self.eew_tracker.revision_count}回)"
+                status_text = self._hud_text(
+                    "tracker_done", self.eew_tracker.revision_count, "訂正完了 ({}回)", self.eew_tracker.revision_count
+                )
                 status_color = (100, 200, 100)  # 绿色
             else:
-                status_text = f"追標中... ({self.eew_tracker.revision_count}回訂正)"
+                status_text = self._hud_text(
+                    "tracker_busy", self.eew_tracker.revision_count, "追標中... ({}回訂正)", self.eew_tracker.revision_count
+                )
                 status_color = (255, 200, 0)  # 黄色
-            surf = self.font_cn_small.render(status_text, True, status_color)
-            self.screen.blit(surf, (20, y))
+            surf = render_text(self.font_cn_small, status_text, status_color)
+            hud.append((surf, (20, y)))
 
         # 推定長周期（M7.0以上显示）
         if ref_mag >= 7.0:
@@ -1165,13 +1580,34 @@ class EarthquakeSimulator:
                 period_level = "3"
                 period_color = (255, 0, 0)  # 红色
 
-            surf = self.font_cn_small.render("推定長周期", True, (200, 200, 200))
-            self.screen.blit(surf, (20, y + 5))
+            surf = render_text(self.font_cn_small, "推定長周期", (200, 200, 200))
+            hud.append((surf, (20, y + 5)))
             # 长周期等级方框
             pygame.draw.rect(self.screen, period_color, (120, y, 35, 25))
-            surf = self.font_cn.render(period_level, True, (255, 255, 255))
+            surf = render_text(self.font_cn, period_level, (255, 255, 255))
             text_rect = surf.get_rect(center=(137, y + 12))
-            self.screen.blit(surf, text_rect)
+            hud.append((surf, text_rect))
+
+        self.screen.blits(hud, doreturn=False)
+
+    def _multi_setup_screen_points(self) -> tuple[list, list]:
+        """断层折线与各震源的屏幕坐标；只在折线/震源增删或视图变化时重算"""
+        self._view_km_params()
+        # _multi_sources_xy 每次增删都会换成新数组，比较对象本身即可判断是否变化
+        key = (self._view_cache_key, tuple(self.fault_line))
+        if (getattr(self, "_multi_setup_points_key", None) != key
+                or self._multi_setup_points_src is not self._multi_sources_xy):
+            self._multi_setup_points_key = key
+            self._multi_setup_points_src = self._multi_sources_xy
+            if self.fault_line:
+                lats, lons = zip(*self.fault_line)
+                fault_points = self.latlons_to_screen(lats, lons).tolist()
+            else:
+                fault_points = []
+            xy = self._multi_sources_xy
+            source_points = self.latlons_to_screen(xy[:, 0], xy[:, 1]).tolist()
+            self._multi_setup_points = (fault_points, source_points)
+        return self._multi_setup_points
 
     def draw_setting_info(self):
         """绘制设置信息（无背景框）"""
@@ -1180,11 +1616,10 @@ class EarthquakeSimulator:
 
         if self.sim_mode == "multi":
             # 绘制断层折线与震源
-            if len(self.fault_line) >= 2:
-                points = [self.latlon_to_screen(lat, lon) for lat, lon in self.fault_line]
-                pygame.draw.lines(self.screen, (180, 180, 220), False, points, 2)
-            for idx, src in enumerate(self.multi_sources):
-                x, y = self.latlon_to_screen(src.lat, src.lon)
+            fault_points, source_points = self._multi_setup_screen_points()
+            if len(fault_points) >= 2:
+                pygame.draw.lines(self.screen, (180, 180, 220), False, fault_points, 2)
+            for src, (x, y) in zip(self.multi_sources, source_points):
                 color = (255, 64, 64) if src == self.multi_start_source else (255, 200, 120)
                 pygame.draw.circle(self.screen, color, (x, y), 6)
                 pygame.draw.circle(self.screen, (0, 0, 0), (x, y), 6, 1)
@@ -1205,10 +1640,10 @@ class EarthquakeSimulator:
                 (f"M{self.temp_mag:.1f} (←→) 深度{self.temp_depth}km (↑↓)", (255, 255, 0)),
                 (f"破裂速度 {self.rupture_velocity:.1f} km/s (C/V 调整)", (200, 200, 200)),
             ]
-            for text, color in texts:
-                surf = self.font_cn.render(text, True, color)
-                self.screen.blit(surf, (15, y))
-                y += 25
+            self.screen.blits(
+                [(render_text(self.font_cn, text, color), (15, y + i * 25)) for i, (text, color) in enumerate(texts)],
+                doreturn=False,
+            )
             return
 
         # 单震源设置
@@ -1218,10 +1653,8 @@ class EarthquakeSimulator:
         icon_scale = min(0.8, max(0.2, 0.15 * self.zoom_level))
 
         if self.position_icon:
-            icon = scale_icon(self.position_icon, icon_scale)
-            tinted = icon.copy()
             tint_color = (int(255 * (1 - depth_ratio)), 0, int(255 * depth_ratio))
-            tinted.fill(tint_color, special_flags=pygame.BLEND_MULT)
+            tinted = tint_icon(scale_icon(self.position_icon, icon_scale), tint_color)
             rect = tinted.get_rect(center=(ex, ey))
             self.screen.blit(tinted, rect)
         else:
@@ -1231,17 +1664,17 @@ class EarthquakeSimulator:
             pygame.draw.line(self.screen, cross_color, (ex, ey-s), (ex, ey+s), 2)
 
         y = WINDOW_HEIGHT - 80
-        location = self.locator.get_location_name(self.temp_lon, self.temp_lat, 'ja')
+        location = self.location_name(self.temp_lat, self.temp_lon, 'ja')
 
         texts = [
             (f"震央: {location}", (255, 255, 255)),
             (f"M{self.temp_mag:.1f} (←→) 深度{self.temp_depth}km (↑↓)", (255, 255, 0)),
             ("左键放置 / Enter开始  |  Tab: 多震源", (180, 180, 180)),
         ]
-        for text, color in texts:
-            surf = self.font_cn.render(text, True, color)
-            self.screen.blit(surf, (15, y))
-            y += 25
+        self.screen.blits(
+            [(render_text(self.font_cn, text, color), (15, y + i * 25)) for i, (text, color) in enumerate(texts)],
+            doreturn=False,
+        )
 
     def draw_help(self):
         """绘制帮助信息"""
@@ -1250,25 +1683,25 @@ class EarthquakeSimulator:
         helps = ["Space:暂停", "R:重置", "+/-:速度", "T:切换显示", "S:导出履歴"]
         y = WINDOW_HEIGHT - 30
         text = "  ".join(helps)
-        surf = self.font_cn_small.render(text, True, (150, 150, 150))
+        surf = render_text(self.font_cn_small, text, (150, 150, 150))
         self.screen.blit(surf, (15, y))
 
-    def draw_mode_button(self):
-        """绘制右上角模式切换按钮"""
-        btn_w, btn_h = 80, 30
-        btn_x = WINDOW_WIDTH - btn_w - 10
-        btn_y = 10
-        self.mode_btn_rect = pygame.Rect(btn_x, btn_y, btn_w, btn_h)
-
-        # 按钮背景
-        pygame.draw.rect(self.screen, (40, 40, 60), self.mode_btn_rect)
-        pygame.draw.rect(self.screen, (100, 100, 120), self.mode_btn_rect, 2)
+    @staticmethod
+    def _render_button(size, text, font, bg_color, border_color) -> pygame.Surface:
+        """把按钮（背景+边框+居中文字）画到一张独立 Surface 上"""
+        surface = pygame.Surface(size).convert()
+        rect = surface.get_rect()
+        pygame.draw.rect(surface, bg_color, rect)
+        pygame.draw.rect(surface, border_color, rect, 2)
+        surf = render_text(font, text, (255, 255, 255))
+        surface.blit(surf, surf.get_rect(center=rect.center))
+        return surface
 
-        # 按钮文字
-        text = "站点" if self.display_mode == MODE_STATION else "区域"
-        surf = self.font_cn.render(text, True, (255, 255, 255))
-        text_rect = surf.get_rect(center=self.mode_btn_rect.center)
-        self.screen.blit(surf, text_rect)
+    def draw_mode_button(self):
+        """绘制右上角模式切换按钮（使用预渲染的按钮图）"""
+        btn_surf = self._mode_btn_surfs[self.display_mode]
+        btn_w = btn_surf.get_width()
+        self.mode_btn_rect = self.screen.blit(btn_surf, (WINDOW_WIDTH - btn_w - 10, 10))
 
     def draw_auto_zoom_button(self):
         """绘制右上角自动缩放按钮"""
@@ -1305,7 +1738,7 @@ class EarthquakeSimulator:
         else:
             text = "自动追踪"
 
-        surf = self.font_cn_small.render(text, True, (255, 255, 255))
+        surf = render_text(self.font_cn_small, text, (255, 255, 255))
         text_rect = surf.get_rect(center=self.auto_zoom_btn_rect.center)
         self.screen.blit(surf, text_rect)
 
@@ -1334,7 +1767,7 @@ class EarthquakeSimulator:
         else:
             text = "隐藏波形"
 
-        surf = self.font_cn_small.render(text, True, (255, 255, 255))
+        surf = render_text(self.font_cn_small, text, (255, 255, 255))
         text_rect = surf.get_rect(center=self.wave_display_btn_rect.center)
         self.screen.blit(surf, text_rect)
 
@@ -1780,8 +2213,6 @@ class EarthquakeSimulator:
             radius_km: 半径（公里）
             smooth: 是否平滑过渡
         """
-        from projection import latlon_to_xy_km, xy_km_to_latlon
-
         # 计算圆的km边界
         cx_km, cy_km = latlon_to_xy_km(center_lat, center_lon)
 
@@ -1792,11 +2223,10 @@ class EarthquakeSimulator:
         y_min_km = cy_km - radius_km * margin
         y_max_km = cy_km + radius_km * margin
 
-        # 转换回经纬度
-        min_lat, _ = xy_km_to_latlon(0, y_min_km)
-        max_lat, _ = xy_km_to_latlon(0, y_max_km)
-        _, min_lon = xy_km_to_latlon(x_min_km, 0)
-        _, max_lon = xy_km_to_latlon(x_max_km, 0)
+        # 转换回经纬度（纬度只取决于 y、经度只取决于 x，一次批量反算）
+        lats, lons = xys_km_to_latlons((x_min_km, x_max_km), (y_min_km, y_max_km))
+        min_lat, max_lat = lats.tolist()
+        min_lon, max_lon = lons.tolist()
 
         # 平滑过渡（线性插值）
         if smooth and hasattr(self, 'map_bounds'):
@@ -1889,11 +2319,10 @@ class EarthquakeSimulator:
         new_y_max_km = anchor_y_km + mouse_y_ratio * new_y_span
         new_y_min_km = new_y_max_km - new_y_span
 
-        # km 边界反算到经纬度边界
-        min_lat, _ = xy_km_to_latlon(0.0, new_y_min_km)
-        max_lat, _ = xy_km_to_latlon(0.0, new_y_max_km)
-        _, min_lon = xy_km_to_latlon(new_x_min_km, 0.0)
-        _, max_lon = xy_km_to_latlon(new_x_max_km, 0.0)
+        # km 边界反算到经纬度边界（纬度只取决于 y、经度只取决于 x，一次批量反算）
+        lats, lons = xys_km_to_latlons((new_x_min_km, new_x_max_km), (new_y_min_km, new_y_max_km))
+        min_lat, max_lat = lats.tolist()
+        min_lon, max_lon = lons.tolist()
 
         self.map_bounds['min_lon'] = min_lon
         self.map_bounds['max_lon'] = max_lon
@@ -1903,228 +2332,273 @@ class EarthquakeSimulator:
         self.zoom_level = new_zoom
 
     def draw_map_boundaries(self):
-        """绘制日本地图边界（只画都道府县级别，不画细分区域）"""
+        """绘制海洋底色与日本地图边界（只画都道府县级别，不画细分区域）
+
+        地图只随平移/缩放变化：整张背景预渲染到 Surface 并按视图缓存，每帧只 blit 一次
+        """
+        self._view_km_params()
+        if getattr(self, "_map_bg_key", None) != self._view_cache_key:
+            self._map_bg_key = self._view_cache_key
+            self._map_bg_surface = self._render_map_background()
+        self.screen.blit(self._map_bg_surface, (0, 0))
+
+    def _render_map_background(self) -> pygame.Surface:
+        """按当前视图把海洋底色 + 都道府县填色/边界画到一张新 Surface 上"""
+        ocean_color = (0x2B, 0x36, 0x45)  # #2B3645
         land_color = (0x3B, 0x42, 0x38)  # #3B4238
         border_color = (0xD2, 0xD4, 0xD8)  # #D2D4D8
 
-        # 使用都道府县数据（47个县），不用细分区域
-        for pref in self.prefectures:
-            geom = pref.get('geometry', {})
-            coords = geom.get('coordinates', [])
-            geom_type = geom.get('type', '')
+        surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+        surface.fill(ocean_color)
+
+        # 使用都道府县数据（47个县），不用细分区域；包围盒在视口外的直接跳过
+        # 放大到一定程度后才需要原始精度的外环
+        rings = self.prefecture_rings if self.zoom_level > PREFECTURE_LOD_ZOOM else self.prefecture_rings_lod
+        for i in self._visible_rings(self.prefecture_bboxes):
+            xy_km, offsets = rings[i]
+            screen_xy = self.km_to_screen_batch(xy_km[:, 0], xy_km[:, 1])
+            # gfxdraw 只接受16位坐标，放大后超出范围的要素退回 draw.polygon
+            use_gfxdraw = np.abs(screen_xy).max() <= _GFXDRAW_LIMIT
+            points_all = screen_xy.tolist()
+            for j in range(len(offsets) - 1):
+                points = points_all[offsets[j]:offsets[j + 1]]
+                if use_gfxdraw:
+                    pygame.gfxdraw.filled_polygon(surface, points, land_color)
+                    pygame.gfxdraw.polygon(surface, points, border_color)
+                else:
+                    pygame.draw.polygon(surface, land_color, points)
+                    pygame.draw.polygon(surface, border_color, points, 1)
+        return surface
+
+    # --- 键盘分派 ------------------------------------------------------
+    def _build_kbd_dispatch(self) -> dict:
+        """按界面状态生成 按键 -> 处理函数 的分派表（初始化时调用一次）"""
+        return {
+            "setting_single": {
+                K_TAB: self._toggle_sim_mode,
+                K_UP: lambda: self._adjust_temp_depth(10),
+                K_DOWN: lambda: self._adjust_temp_depth(-10),
+                K_RIGHT: lambda: self._adjust_temp_mag(0.1),
+                K_LEFT: lambda: self._adjust_temp_mag(-0.1),
+                K_RETURN: self._start_single_simulation,
+                K_r: self._reset_single_setting,
+            },
+            "setting_multi": {
+                K_TAB: self._toggle_sim_mode,
+                K_UP: lambda: self._adjust_temp_depth(5),
+                K_DOWN: lambda: self._adjust_temp_depth(-5),
+                K_RIGHT: lambda: self._adjust_temp_mag(0.1),
+                K_LEFT: lambda: self._adjust_temp_mag(-0.1),
+                K_c: lambda: self._adjust_rupture_velocity(-0.2),
+                K_v: lambda: self._adjust_rupture_velocity(0.2),
+                K_d: self._cycle_multi_direction,
+                K_r: self.reset_multi_setup,
+                K_RETURN: self._advance_multi_setup,
+            },
+            "running": {
+                K_SPACE: self._toggle_pause,
+                K_r: self._reset_simulation,
+                K_s: self._export_history,
+                K_t: self._toggle_display_mode,
+                K_EQUALS: lambda: self._scale_time(1.5),
+                K_PLUS: lambda: self._scale_time(1.5),
+                K_MINUS: lambda: self._scale_time(1 / 1.5),
+            },
+        }
+
+    def _keyboard_state(self) -> str:
+        """当前键盘分派表的键"""
+        if not self.setting_mode:
+            return "running"
+        return "setting_single" if self.sim_mode == "single" else "setting_multi"
 
-            if geom_type == 'Polygon':
-                polys = [coords[0]]
-            elif geom_type == 'MultiPolygon':
-                polys = [c[0] for c in coords]
-            else:
-                continue
+    def _toggle_sim_mode(self):
+        """切换单/多模式"""
+        self.sim_mode = "multi" if self.sim_mode == "single" else "single"
+        self.earthquake = None
+        self.reset_multi_setup()
+
+    def _adjust_temp_depth(self, delta: float):
+        """调整设置深度；多震源模式下同步更新所有已放置震源点的深度"""
+        self.temp_depth = max(0, min(700, self.temp_depth + delta))
+        if self.sim_mode == "multi":
+            for src in self.multi_sources:
+                src.depth = self.temp_depth
+                src.eq.depth = self.temp_depth
+
+    def _adjust_temp_mag(self, delta: float):
+        """调整设置震级；多震源模式下同步更新所有已放置震源点的震级"""
+        self.temp_mag = max(1.0, min(9.5, self.temp_mag + delta))
+        if self.sim_mode == "multi":
+            for src in self.multi_sources:
+                src.magnitude = self.temp_mag
+                src.eq.magnitude = self.temp_mag
+
+    def _adjust_rupture_velocity(self, delta: float):
+        self.rupture_velocity = max(0.5, min(10.0, self.rupture_velocity + delta))
+
+    def _cycle_multi_direction(self):
+        """破裂方向循环切换 forward -> backward -> both（仅在选择起点阶段）"""
+        if self.multi_state != "choose_start":
+            return
+        if self.multi_direction == "forward":
+            self.multi_direction = "backward"
+        elif self.multi_direction == "backward":
+            self.multi_direction = "both"
+        else:
+            self.multi_direction = "forward"
+
+    def _advance_multi_setup(self):
+        """Enter：推进多震源设置步骤，最后一步启动模拟"""
+        if self.multi_state == "draw_fault" and len(self.fault_line) >= 2:
+            self.multi_state = "place_sources"
+        elif self.multi_state == "place_sources" and len(self.multi_sources) >= 1:
+            self.multi_state = "choose_start"
+        elif self.multi_state == "choose_start" and len(self.multi_sources) >= 1:
+            self.start_multi_simulation()
+
+    def _reset_single_setting(self):
+        self.temp_lat = 35.7
+        self.temp_lon = 139.7
+        self.temp_depth = 10
+        self.temp_mag = 6.0
+
+    def _start_single_simulation(self):
+        """Enter：按当前设置启动单震源模拟"""
+        # 保存真实震央位置（不随EEW修正而改变）
+        self.true_epicenter_lat = self.temp_lat
+        self.true_epicenter_lon = self.temp_lon
+        self.true_depth = self.temp_depth  # 保存真实深度
+        self.true_mag = self.temp_mag  # 保存真实震级
+
+        # 创建真实地震对象（始终使用真实震央位置，用于站点震度计算）
+        self.true_earthquake = Earthquake(
+            self.temp_lat, self.temp_lon,
+            self.temp_depth, self.temp_mag
+        )
+
+        # 创建EEW追标器（禁用时为空追标器，始终报告真实值）
+        self.eew_tracker = make_eew_tracker(
+            self.temp_lat, self.temp_lon,
+            self.temp_depth, self.temp_mag,
+            enabled=self.eew_tracking_enabled
+        )
+        # 使用追标器的初始值创建地震（用于追标波形显示）
+        lat, lon, depth, mag = self.eew_tracker.get_current_values()
+        self.earthquake = Earthquake(lat, lon, depth, mag)
+
+        # 启动自动追踪（P波跟随模式）
+        self.start_auto_tracking()
+        self.clear_location_cache()
+
+        # 不在开始时播放EEW警报音,等站点检测到地震波时才播放
+        # 重置音频播报状态
+        if self.sound_manager:
+            self.sound_manager.reset_announcement()
+
+        self.setting_mode = False
+        self.region_intensities = {}
+        self.max_intensity = 0
+        self.detected_regions = []
+        self.intensity4_played = False
+        self.intensity7_played = False
+        self.keihou_played = False
+        self.max_triggered_intensity = 0.0
+        self.alert_animations.clear()
+        self.eew_alert_played = False  # 重置EEW警报音播放状态
+        self.tracking_wave_visible = False  # 重置追标波形显示状态
+        self.triggered_intensity_sounds = set()  # 重置音效触发记录
+
+        # 重置站点管理器
+        if self.station_manager:
+            self.station_manager.reset()
+
+        # 清空履歴记录，开始新的记录
+        if hasattr(self, 'history'):
+            self.history.clear()
+            print("[履歴] 开始新的地震记录")
+
+    def _toggle_pause(self):
+        self.paused = not self.paused
+
+    def _reset_simulation(self):
+        """R：结束当前模拟，回到设置界面"""
+        self.earthquake = None
+        self.true_earthquake = None  # 重置真实地震对象
+        self.eew_tracker = None  # 重置追标器
+        self.true_epicenter_lat = None  # 重置真实震央位置
+        self.true_epicenter_lon = None
+        self.true_depth = None  # 重置真实深度
+        self.true_mag = None  # 重置真实震级
+        self.reset_auto_tracking()  # 重置追踪状态
+        self.setting_mode = True
+        self._clear_station_hits()
+        self.region_max_intensities = {}
+        self.max_intensity = 0
+        self.intensity4_played = False
+        self.intensity7_played = False
+        self.keihou_played = False
+        self.max_triggered_intensity = 0.0
+        self.alert_animations.clear()
+        self.station_flash_animations.clear()  # 重置站点闪烁动画
+        self.intensity_flash_counts = {}  # 重置闪烁次数计数
+        self.eew_alert_played = False  # 重置EEW警报音播放状态
+        self.tracking_wave_visible = False  # 重置追标波形显示状态
+        self.first_detection_time = None  # 重置首次检测时间
+        self.triggered_intensity_sounds = set()  # 重置音效触发记录
 
-            for poly in polys:
-                points = [self.latlon_to_screen(lat, lon) for lon, lat in poly]
-                if len(points) >= 3:
-                    pygame.draw.polygon(self.screen, land_color, points)
-                    pygame.draw.polygon(self.screen, border_color, points, 1)
+        # 重置站点管理器
+        if self.station_manager:
+            self.station_manager.reset()
+
+        # 重置地图缩放
+        self.map_bounds = MAP_BOUNDS.copy()
+        self.zoom_level = 1.0
+
+        # 清空履歴记录
+        if hasattr(self, 'history'):
+            self.history.clear()
+            print("[履歴] 已清空历史记录")
+
+        if self.sim_mode == "multi":
+            self.reset_multi_setup()
+
+    def _export_history(self):
+        """S键：导出履歴记录"""
+        if hasattr(self, 'history') and self.earthquake:
+            import time
+            filename = f"earthquake_history_{int(time.time())}.txt"
+            self.history.export_to_file(filename)
+            summary = self.history.get_summary()
+            print(f"[总结] 时长: {summary['duration']:.1f}秒, "
+                  f"最大震度: {summary['max_intensity']:.1f}, "
+                  f"记录数: {summary['total_records']}")
+
+    def _toggle_display_mode(self):
+        self.display_mode = MODE_STATION if self.display_mode == MODE_REGION else MODE_REGION
+
+    def _scale_time(self, factor: float):
+        self.time_scale = max(0.1, min(10, self.time_scale * factor))
 
     def handle_events(self):
         """处理事件"""
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_TAB and self.setting_mode:
-                    # 切换单/多模式
-                    self.sim_mode = "multi" if self.sim_mode == "single" else "single"
-                    self.earthquake = None
-                    self.reset_multi_setup()
-                    continue
+            # 任何输入/窗口事件都可能改变画面状态
+            self._dirty = True
 
-                if self.setting_mode:
-                    if self.sim_mode == "single":
-                        if event.key == pygame.K_UP:
-                            self.temp_depth = min(700, self.temp_depth + 10)
-                        elif event.key == pygame.K_DOWN:
-                            self.temp_depth = max(0, self.temp_depth - 10)
-                        elif event.key == pygame.K_RIGHT:
-                            self.temp_mag = min(9.5, self.temp_mag + 0.1)
-                        elif event.key == pygame.K_LEFT:
-                            self.temp_mag = max(1.0, self.temp_mag - 0.1)
-                        elif event.key == pygame.K_RETURN:
-                            # 保存真实震央位置（不随EEW修正而改变）
-                            self.true_epicenter_lat = self.temp_lat
-                            self.true_epicenter_lon = self.temp_lon
-                            self.true_depth = self.temp_depth  # 保存真实深度
-                            self.true_mag = self.temp_mag  # 保存真实震级
-
-                            # 创建真实地震对象（始终使用真实震央位置，用于站点震度计算）
-                            self.true_earthquake = Earthquake(
-                                self.temp_lat, self.temp_lon,
-                                self.temp_depth, self.temp_mag
-                            )
-
-                            # 创建EEW追标器
-                            if self.eew_tracking_enabled:
-                                self.eew_tracker = EEWTracker(
-                                    self.temp_lat, self.temp_lon,
-                                    self.temp_depth, self.temp_mag,
-                                    enabled=True
-                                )
-                                # 使用追标器的初始值创建地震（用于追标波形显示）
-                                lat, lon, depth, mag = self.eew_tracker.get_current_values()
-                                self.earthquake = Earthquake(lat, lon, depth, mag)
-                            else:
-                                self.eew_tracker = None
-                                self.earthquake = Earthquake(
-                                    self.temp_lat, self.temp_lon,
-                                    self.temp_depth, self.temp_mag
-                                )
-
-                            # 启动自动追踪（P波跟随模式）
-                            self.start_auto_tracking()
-
-                            # 不在开始时播放EEW警报音,等站点检测到地震波时才播放
-                            # 重置音频播报状态
-                            if self.sound_manager:
-                                self.sound_manager.reset_announcement()
-
-                            self.setting_mode = False
-                            self.region_intensities = {}
-                            self.max_intensity = 0
-                            self.detected_regions = []
-                            self.intensity4_played = False
-                            self.intensity7_played = False
-                            self.keihou_played = False
-                            self.max_triggered_intensity = 0.0
-                            self.alert_animations.clear()
-                            self.eew_alert_played = False  # 重置EEW警报音播放状态
-                            self.tracking_wave_visible = False  # 重置追标波形显示状态
-                            self.triggered_intensity_sounds = set()  # 重置音效触发记录
-
-                            # 重置站点管理器
-                            if self.station_manager:
-                                self.station_manager.reset()
-
-                            # 清空履歴记录，开始新的记录
-                            if hasattr(self, 'history'):
-                                self.history.clear()
-                                print("[履歴] 开始新的地震记录")
-                        elif event.key == pygame.K_r:
-                            self.temp_lat = 35.7
-                            self.temp_lon = 139.7
-                            self.temp_depth = 10
-                            self.temp_mag = 6.0
-                    else:
-                        # 多震源设置阶段
-                        if event.key == pygame.K_UP:
-                            self.temp_depth = min(700, self.temp_depth + 5)
-                            # 同步更新所有已放置震源点的深度
-                            for src in self.multi_sources:
-                                src.depth = self.temp_depth
-                                src.eq.depth = self.temp_depth
-                        elif event.key == pygame.K_DOWN:
-                            self.temp_depth = max(0, self.temp_depth - 5)
-                            # 同步更新所有已放置震源点的深度
-                            for src in self.multi_sources:
-                                src.depth = self.temp_depth
-                                src.eq.depth = self.temp_depth
-                        elif event.key == pygame.K_RIGHT:
-                            self.temp_mag = min(9.5, self.temp_mag + 0.1)
-                            # 同步更新所有已放置震源点的震级
-                            for src in self.multi_sources:
-                                src.magnitude = self.temp_mag
-                                src.eq.magnitude = self.temp_mag
-                        elif event.key == pygame.K_LEFT:
-                            self.temp_mag = max(1.0, self.temp_mag - 0.1)
-                            # 同步更新所有已放置震源点的震级
-                            for src in self.multi_sources:
-                                src.magnitude = self.temp_mag
-                                src.eq.magnitude = self.temp_mag
-                        elif event.key == pygame.K_c:
-                            self.rupture_velocity = max(0.5, self.rupture_velocity - 0.2)
-                        elif event.key == pygame.K_v:
-                            self.rupture_velocity = min(10.0, self.rupture_velocity + 0.2)
-                        elif event.key == pygame.K_d and self.multi_state == "choose_start":
-                            if self.multi_direction == "forward":
-                                self.multi_direction = "backward"
-                            elif self.multi_direction == "backward":
-                                self.multi_direction = "both"
-                            else:
-                                self.multi_direction = "forward"
-                        elif event.key == pygame.K_r:
-                            self.reset_multi_setup()
-                        elif event.key == pygame.K_RETURN:
-                            if self.multi_state == "draw_fault" and len(self.fault_line) >= 2:
-                                self.multi_state = "place_sources"
-                            elif self.multi_state == "place_sources" and len(self.multi_sources) >= 1:
-                                self.multi_state = "choose_start"
-                            elif self.multi_state == "choose_start" and len(self.multi_sources) >= 1:
-                                self.start_multi_simulation()
-                else:
-                    if event.key == pygame.K_SPACE:
-                        self.paused = not self.paused
-                    elif event.key == pygame.K_r:
-                        self.earthquake = None
-                        self.true_earthquake = None  # 重置真实地震对象
-                        self.eew_tracker = None  # 重置追标器
-                        self.true_epicenter_lat = None  # 重置真实震央位置
-                        self.true_epicenter_lon = None
-                        self.true_depth = None  # 重置真实深度
-                        self.true_mag = None  # 重置真实震级
-                        self.reset_auto_tracking()  # 重置追踪状态
-                        self.setting_mode = True
-                        self.station_intensities = {}
-                        self.region_max_intensities = {}
-                        self.max_intensity = 0
-                        self.intensity4_played = False
-                        self.intensity7_played = False
-                        self.keihou_played = False
-                        self.max_triggered_intensity = 0.0
-                        self.alert_animations.clear()
-                        self.station_flash_animations.clear()  # 重置站点闪烁动画
-                        self.intensity_flash_counts = {}  # 重置闪烁次数计数
-                        self.eew_alert_played = False  # 重置EEW警报音播放状态
-                        self.tracking_wave_visible = False  # 重置追标波形显示状态
-                        self.first_detection_time = None  # 重置首次检测时间
-                        self.triggered_intensity_sounds = set()  # 重置音效触发记录
+            if event.type == QUIT:
+                self.running = False
 
-                        # 重置站点管理器
-                        if self.station_manager:
-                            self.station_manager.reset()
+            elif event.type == KEYDOWN:
+                handler = self._kbd_dispatch[self._keyboard_state()].get(event.key)
+                if handler:
+                    handler()
 
-                        # 重置地图缩放
-                        self.map_bounds = MAP_BOUNDS.copy()
-                        self.zoom_level = 1.0
-
-                        # 清空履歴记录
-                        if hasattr(self, 'history'):
-                            self.history.clear()
-                            print("[履歴] 已清空历史记录")
-
-                        if self.sim_mode == "multi":
-                            self.reset_multi_setup()
-                    elif event.key == pygame.K_s:
-                        # S键：导出履歴记录
-                        if hasattr(self, 'history') and self.earthquake:
-                            import time
-                            filename = f"earthquake_history_{int(time.time())}.txt"
-                            self.history.export_to_file(filename)
-                            summary = self.history.get_summary()
-                            print(f"[总结] 时长: {summary['duration']:.1f}秒, "
-                                  f"最大震度: {summary['max_intensity']:.1f}, "
-                                  f"记录数: {summary['total_records']}")
-                    elif event.key == pygame.K_t:
-                        self.display_mode = MODE_STATION if self.display_mode == MODE_REGION else MODE_REGION
-                    elif event.key == pygame.K_EQUALS or event.key == pygame.K_PLUS:
-                        self.time_scale = min(10, self.time_scale * 1.5)
-                    elif event.key == pygame.K_MINUS:
-                        self.time_scale = max(0.1, self.time_scale / 1.5)
-
-            elif event.type == pygame.MOUSEBUTTONDOWN:
+            elif event.type == MOUSEBUTTONDOWN:
                 if event.button == 1:  # 左键
                     # 检查是否点击了模式按钮
                     if hasattr(self, 'mode_btn_rect') and self.mode_btn_rect.collidepoint(event.pos):
-                        self.display_mode = MODE_STATION if self.display_mode == MODE_REGION else MODE_REGION
+                        self._toggle_display_mode()
                     # 检查是否点击了自动追踪按钮
                     elif hasattr(self, 'auto_zoom_btn_rect') and self.auto_zoom_btn_rect.collidepoint(event.pos):
                         if self.auto_zoom_mode == "off" and not self.setting_mode:
@@ -2159,15 +2633,11 @@ class EarthquakeSimulator:
                             elif self.multi_state == "place_sources":
                                 snap_lat, snap_lon = self.project_to_fault(lat, lon)
                                 self.multi_sources.append(RuptureSource(snap_lat, snap_lon, self.temp_depth, self.temp_mag))
+                                self._sync_multi_sources_xy()
                             elif self.multi_state == "choose_start" and self.multi_sources:
-                                # 选择最近的震源为起点
-                                best_idx = 0
-                                best_d = float("inf")
-                                for i, src in enumerate(self.multi_sources):
-                                    d = math.hypot(src.lat - lat, src.lon - lon)
-                                    if d < best_d:
-                                        best_d = d
-                                        best_idx = i
+                                # 选择最近的震源为起点（比较平方距离即可，无需开方）
+                                d2 = ((self._multi_sources_xy - (lat, lon)) ** 2).sum(axis=1)
+                                best_idx = int(np.argmin(d2))
                                 self.multi_start_source = self.multi_sources[best_idx]
                 elif event.button == 3:  # 右键
                     if self.setting_mode and self.sim_mode == "multi":
@@ -2175,6 +2645,7 @@ class EarthquakeSimulator:
                             self.fault_line.pop()
                         elif self.multi_state == "place_sources" and self.multi_sources:
                             self.multi_sources.pop()
+                            self._sync_multi_sources_xy()
                     elif not self.setting_mode and self.sim_mode == "single":
                         # 只有单震源模式下才允许右键重置
                         self.earthquake = None
@@ -2185,7 +2656,7 @@ class EarthquakeSimulator:
                         self.true_depth = None
                         self.true_mag = None
                         self.setting_mode = True
-                        self.station_intensities = {}
+                        self._clear_station_hits()
                         self.region_max_intensities = {}
                         self.intensity4_played = False
                         self.intensity7_played = False
@@ -2199,12 +2670,9 @@ class EarthquakeSimulator:
                         # 重置站点管理器
                         if self.station_manager:
                             self.station_manager.reset()
-                elif event.button == 4:  # 滚轮向上 - 放大
-                    self.zoom_map(event.pos, 1.2)
-                elif event.button == 5:  # 滚轮向下 - 缩小
-                    self.zoom_map(event.pos, 0.8)
 
-            elif event.type == pygame.MOUSEWHEEL:
+            # 滚轮缩放只走 MOUSEWHEEL（SDL2 下滚轮同时产生 button 4/5 事件，重复处理会缩放两次）
+            elif event.type == MOUSEWHEEL:
                 if event.y > 0:
                     self.zoom_map(pygame.mouse.get_pos(), 1.2)
                 elif event.y < 0:
@@ -2212,14 +2680,26 @@ class EarthquakeSimulator:
 
     def run(self):
         """主循环"""
-        self.station_intensities = {}
+        self._clear_station_hits()
         self.region_max_intensities = {}
+        self._dirty = True  # 画面是否需要重绘（空闲的设置界面/暂停时不重绘）
 
         while self.running:
             dt = self.clock.tick(FPS) / 1000.0
 
             self.handle_events()
 
+            # 送出排队中的下一条播报语音
+            if self.sound_manager:
+                self.sound_manager.update()
+
+            # 模拟推进中每帧都要重绘；动画都按模拟时间计时，暂停时画面静止
+            if not self.paused and (
+                (self.sim_mode == "single" and self.earthquake)
+                or (self.sim_mode == "multi" and self.multi_manager)
+            ):
+                self._dirty = True
+
             # 更新
             if not self.paused:
                 if self.sim_mode == "single" and self.earthquake:
@@ -2285,15 +2765,12 @@ class EarthquakeSimulator:
 
                     # 更新EEW追标器（站点驱动）
                     # 重要：只有追标波形可见后才开始订正，避免"凭空订正"
-                    if self.eew_tracker and self.tracking_wave_visible:
+                    if self.tracking_wave_visible:
                         # 统计检测到P波的站点数（用于追标）- 比震度>=3更可靠
                         if self.station_manager:
                             detected_station_count = self.station_manager.get_detected_station_count()
                         else:
-                            detected_station_count = sum(
-                                1 for (_, _), (intensity, _) in self.station_intensities.items()
-                                if intensity >= 0  # P波到达即可
-                            )
+                            detected_station_count = int(self.st_hit_idx.size)  # P波到达即可
 
                         # 站点驱动修正
                         was_revised = self.eew_tracker.update(detected_station_count, self.earthquake.time)
@@ -2319,10 +2796,11 @@ class EarthquakeSimulator:
                     self.multi_manager.update(dt * self.time_scale)
                     self.calculate_station_intensities()
 
-            # 绘制
-            self.screen.fill((0x2B, 0x36, 0x45))  # 海洋颜色 #2B3645
+            if not self._dirty:
+                continue
 
-            # 先绘制地图边界（两种模式共用）
+            # 分层绘制：静态地图背景只在视图变化时重建，动态层每帧重画，UI 最后叠加
+            # 绘制：先铺地图背景（海洋+都道府县边界，两种模式共用）
             self.draw_map_boundaries()
 
             # 绘制区域填色（两种模式共用）
@@ -2353,6 +2831,7 @@ class EarthquakeSimulator:
             self.draw_wave_display_button()  # 绘制波形显示按钮
 
             pygame.display.flip()
+            self._dirty = False
 
         pygame.quit()
 
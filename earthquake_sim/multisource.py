@@ -5,9 +5,11 @@ import math
 from dataclasses import dataclass, field
 from typing import List, Optional, Tuple
 
+import numpy as np
+
 from earthquake import Earthquake
-from intensity import calc_jma_intensity
-from projection import latlon_to_xy_km
+from intensity import calc_jma_intensity, calc_jma_intensity_batch
+from projection import latlon_to_xy_km, latlons_to_xy_km
 
 
 @dataclass
@@ -66,13 +68,17 @@ class MultiSourceManager:
             cumulative.append(cumulative[-1] + math.hypot(x1 - x0, y1 - y0))
         return km_points, cumulative
 
-    def _project_distance_on_fault(self, lat: float, lon: float) -> float:
-        """计算点在折线上的投影距离（km）。"""
+    def _project_distance_on_fault(self, lat: float, lon: float, polyline_km=None) -> float:
+        """计算点在折线上的投影距离（km）。
+
+        polyline_km: 可选，预先算好的 _polyline_km() 结果（批量投影时避免重复计算）
+        """
         if len(self.polyline) < 2:
             return 0.0
-        km_points, cumulative = self._polyline_km()
+        km_points, cumulative = polyline_km or self._polyline_km()
         px, py = latlon_to_xy_km(lat, lon)
-        best_dist = 0.0
+        best_i = -1
+        best_proj = (0.0, 0.0)
         best_d2 = float("inf")
         for i in range(len(km_points) - 1):
             (x0, y0), (x1, y1) = km_points[i], km_points[i + 1]
@@ -84,12 +90,17 @@ class MultiSourceManager:
             t_clamped = max(0.0, min(1.0, t))
             proj_x = x0 + t_clamped * vx
             proj_y = y0 + t_clamped * vy
-            d2 = (proj_x - px) ** 2 + (proj_y - py) ** 2
+            # 只比较平方距离，最近段确定后再开方求沿线里程
+            dx, dy = proj_x - px, proj_y - py
+            d2 = dx * dx + dy * dy
             if d2 < best_d2:
                 best_d2 = d2
-                along = math.hypot(proj_x - x0, proj_y - y0)
-                best_dist = cumulative[i] + along
-        return best_dist
+                best_i = i
+                best_proj = (proj_x, proj_y)
+        if best_i < 0:
+            return 0.0
+        x0, y0 = km_points[best_i]
+        return cumulative[best_i] + math.hypot(best_proj[0] - x0, best_proj[1] - y0)
 
     def _sort_sources_by_fault(self) -> List[RuptureSource]:
         if not self.sources:
@@ -99,8 +110,9 @@ class MultiSourceManager:
             for src in self.sources:
                 src.distance_on_fault = src.lon
             return sorted(self.sources, key=lambda s: s.distance_on_fault)
+        polyline_km = self._polyline_km()
         for src in self.sources:
-            src.distance_on_fault = self._project_distance_on_fault(src.lat, src.lon)
+            src.distance_on_fault = self._project_distance_on_fault(src.lat, src.lon, polyline_km)
         return sorted(self.sources, key=lambda s: s.distance_on_fault)
 
     def recompute_activation_times(self):
@@ -194,3 +206,36 @@ class MultiSourceManager:
                     max_is_s = False
 
         return max_intensity, max_is_s
+
+    def calc_intensity_batch(self, x_km: np.ndarray, y_km: np.ndarray, bai: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """calc_intensity 的数组版本：站点已投影到平面(km)，bai 为场地倍率派生量。
+
+        所有已激活震源一次性按 (站点数, 震源数) 矩阵计算，再逐站取最大值。
+        返回 (intensities, is_s_wave) 两个数组，未达到0.5的站点震度为0。
+        """
+        active = [src for src in self.sources if src.active]
+        if not active:
+            return np.zeros_like(x_km, dtype=np.float64), np.zeros(np.shape(x_km), dtype=bool)
+
+        src_x, src_y = latlons_to_xy_km([src.eq.lat for src in active], [src.eq.lon for src in active])
+        mags = np.array([src.eq.magnitude for src in active], dtype=np.float64)
+        depths = np.array([src.eq.depth for src in active], dtype=np.float64)
+        s_radius = np.array([src.eq.get_s_wave_radius() for src in active], dtype=np.float64)
+        p_radius = np.array([src.eq.get_p_wave_radius() for src in active], dtype=np.float64)
+
+        bai = np.asarray(bai, dtype=np.float64)
+        if bai.ndim:
+            bai = bai[:, None]
+
+        epicentral_dist = np.hypot(x_km[:, None] - src_x, y_km[:, None] - src_y)  # (N, M)
+        s_intensity = calc_jma_intensity_batch(mags, depths, epicentral_dist, bai=bai)
+        p_intensity = s_intensity / 1.5 - 0.5
+
+        s_hit = (epicentral_dist <= s_radius) & (s_intensity >= 0.5)
+        p_hit = ~s_hit & (epicentral_dist <= p_radius) & (p_intensity >= 0.5)
+        intensity = np.where(s_hit, s_intensity, np.where(p_hit, p_intensity, 0.0))
+
+        # argmax 取第一个最大值，与逐震源严格大于比较的结果一致
+        best = np.argmax(intensity, axis=1)
+        rows = np.arange(intensity.shape[0])
+        return intensity[rows, best], s_hit[rows, best]
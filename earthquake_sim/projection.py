@@ -8,6 +8,8 @@ from __future__ import annotations
 
 import math
 
+import numpy as np
+
 from config import SCRATCH_MERCATOR_Y_SCALE, SCRATCH_REF_LAT, SCRATCH_REF_LON, SCRATCH_X_KM_PER_DEG
 
 
@@ -29,6 +31,17 @@ def latlon_to_xy_km(lat_deg: float, lon_deg: float) -> tuple[float, float]:
     return x_km, y_km
 
 
+def latlons_to_xy_km(lats_deg, lons_deg) -> tuple[np.ndarray, np.ndarray]:
+    """经纬度数组(度) → 平面坐标数组(km)，与 latlon_to_xy_km 逐点结果一致。"""
+    lats = np.asarray(lats_deg, dtype=np.float64)
+    lons = np.asarray(lons_deg, dtype=np.float64)
+    sin_phi = np.clip(np.sin(np.radians(lats)), -0.999999999999, 0.999999999999)
+    merc = 0.5 * np.log((1.0 + sin_phi) / (1.0 - sin_phi))
+    x_km = (lons - SCRATCH_REF_LON) * SCRATCH_X_KM_PER_DEG
+    y_km = (merc - _REF_MERCATOR_TERM) * SCRATCH_MERCATOR_Y_SCALE
+    return x_km, y_km
+
+
 def xy_km_to_latlon(x_km: float, y_km: float) -> tuple[float, float]:
     """平面坐标(km) → 经纬度(度)。"""
     lon = x_km / SCRATCH_X_KM_PER_DEG + SCRATCH_REF_LON
@@ -40,3 +53,12 @@ def xy_km_to_latlon(x_km: float, y_km: float) -> tuple[float, float]:
     lat = math.degrees(math.asin(sin_phi))
     return lat, lon
 
+
+def xys_km_to_latlons(xs_km, ys_km) -> tuple[np.ndarray, np.ndarray]:
+    """平面坐标数组(km) → 经纬度数组(度)，与 xy_km_to_latlon 逐点结果一致。"""
+    xs = np.asarray(xs_km, dtype=np.float64)
+    ys = np.asarray(ys_km, dtype=np.float64)
+    lons = xs / SCRATCH_X_KM_PER_DEG + SCRATCH_REF_LON
+    merc = ys / SCRATCH_MERCATOR_Y_SCALE + _REF_MERCATOR_TERM
+    lats = np.degrees(np.arcsin(np.clip(np.tanh(merc), -1.0, 1.0)))
+    return lats, lons
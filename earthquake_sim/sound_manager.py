@@ -6,8 +6,26 @@
 """
 import pygame
 import os
+from collections import deque
 from pathlib import Path
 
+from config import AUDIO_BUFFER_SIZE, AUDIO_FREQUENCY
+
+# 震度 → 音频名查找表，以 int(震度*2) 为索引（震度先钳制到0-7，索引0-14）
+# 震度5強/6弱 使用 intensity_5，震度6強/7 使用 intensity_6
+_INTENSITY_SOUND_LUT = (
+    'intensity_0', 'intensity_0',   # 0.0-0.9
+    'intensity_1', 'intensity_1',   # 1.0-1.9
+    'intensity_2', 'intensity_2',   # 2.0-2.9
+    'intensity_3', 'intensity_3',   # 3.0-3.9
+    'intensity_4', 'intensity_4',   # 4.0-4.9
+    'intensity_5',                  # 5.0-5.4 震度5弱
+    'intensity_5',                  # 5.5-5.9 震度5強
+    'intensity_5',                  # 6.0-6.4 震度6弱
+    'intensity_6',                  # 6.5-6.9 震度6強
+    'intensity_6',                  # 7.0     震度7
+)
+
 class SoundManager:
     """
     音频管理器 - 播放预录制音频
@@ -15,16 +33,18 @@ class SoundManager:
     从 強震モニタ風地震シュミレーション v1.10 提取的音频文件
     """
     
-    def __init__(self, audio_dir='assets/audio'):
+    def __init__(self, audio_dir='assets/audio', buffer_size=AUDIO_BUFFER_SIZE):
         """
         初始化音频管理器
         
         Args:
             audio_dir: 音频文件目录（相对于earthquake_sim/）
+            buffer_size: mixer缓冲区大小（采样数）。越小起音越快，但弱机器上可能断音；
+                仅在mixer尚未初始化时生效，否则应在 pygame.init() 前调用 pygame.mixer.pre_init
         """
         # 初始化pygame mixer
         if not pygame.mixer.get_init():
-            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+            pygame.mixer.init(frequency=AUDIO_FREQUENCY, size=-16, channels=2, buffer=buffer_size)
         
         # 音频目录路径
         base_dir = Path(__file__).parent
@@ -66,6 +86,16 @@ class SoundManager:
             'intensity_5': 'f0eccaf0dae87cb74f9bd27d27e3c5f1.wav',  # 2.60秒 (可能是"震度5強")
             'intensity_6': '43c1927b88049e83cb01670fc0dfcfed.wav',  # 2.60秒 (可能是"震度6強")
         }
+
+        # 播音员语音在专用通道上按顺序播放（避免多条播报互相重叠）
+        # 警报音/提示音不属于语音，仍在普通通道上播放，可与语音叠加
+        self.voice_names = {
+            name for name in self.audio_files if name not in ('eew', 'chime')
+        }
+        pygame.mixer.set_reserved(1)
+        self.voice_channel = pygame.mixer.Channel(0)
+        # Channel.queue() 只能挂一条，多出来的语音在这里排队，由 update() 逐条送出
+        self.voice_queue = deque()
         
         # 加载音频
         self.load_sounds()
@@ -113,7 +143,10 @@ class SoundManager:
             try:
                 sound = self.sounds[sound_name]
                 sound.set_volume(volume)
-                sound.play()
+                if sound_name in self.voice_names:
+                    self._play_voice(sound)
+                else:
+                    sound.play()
                 return True
             except Exception as e:
                 print(f"[音频管理器] 播放失败 {sound_name}: {e}")
@@ -122,8 +155,21 @@ class SoundManager:
             print(f"[音频管理器] 音频不存在: {sound_name}")
             return False
     
+    def _play_voice(self, sound):
+        """在语音通道播放：空闲时立即播放，正在播报时排队到当前语音之后"""
+        if self.voice_channel.get_busy() or self.voice_queue:
+            self.voice_queue.append(sound)
+        else:
+            self.voice_channel.play(sound)
+
+    def update(self):
+        """每帧调用：语音通道空闲时播放下一条排队的语音"""
+        if self.voice_queue and not self.voice_channel.get_busy():
+            self.voice_channel.play(self.voice_queue.popleft())
+
     def stop_all(self):
         """停止所有音频"""
+        self.voice_queue.clear()
         pygame.mixer.stop()
     
     # ========== 快捷播放方法 ==========
@@ -162,24 +208,9 @@ class SoundManager:
         Returns:
             bool: 是否成功播放
         """
-        # JMA震度等级转换
-        if intensity < 0:
-            intensity = 0
-        elif intensity > 7:
-            intensity = 7
-        
-        # 震度5+, 6+, 7 映射到 5, 6
-        if intensity >= 7:
-            sound_name = 'intensity_6'  # 震度7也用震度6的音频
-        elif intensity >= 6.5:
-            sound_name = 'intensity_6'  # 震度6強
-        elif intensity >= 5.5:
-            sound_name = 'intensity_5'  # 震度5強
-        else:
-            intensity_level = int(intensity)
-            if intensity_level > 6:
-                intensity_level = 6
-            sound_name = f'intensity_{intensity_level}'
+        # JMA震度等级转换（钳制到0-7后查表）
+        intensity = max(0.0, min(7.0, intensity))
+        sound_name = _INTENSITY_SOUND_LUT[int(intensity * 2)]
         
         return self.play(sound_name, volume=0.9)
     
@@ -243,7 +274,8 @@ def test_sound_manager():
     print("音频管理器测试")
     print("=" * 70)
     
-    # 初始化pygame
+    # 初始化pygame（先设置小缓冲区）
+    pygame.mixer.pre_init(AUDIO_FREQUENCY, -16, 2, AUDIO_BUFFER_SIZE)
     pygame.init()
     
     manager = SoundManager()
@@ -1,20 +1,38 @@
 """站点管理和渲染系统"""
 
+import heapq
 import json
 import pygame
 import math
 from typing import List, Tuple, Optional, Dict
+
+import numpy as np
+
 from config import *
-from intensity import intensity_to_scale
+from intensity import calc_jma_intensity, calc_jma_intensity_batch, intensity_to_scale_indices
+from projection import latlon_to_xy_km, latlons_to_xy_km
+from surface_cache import SurfaceCache
+
+# 缩放结果缓存：原图 × (宽, 高) -> 缩放图
+_SCALED_ICON_CACHE = SurfaceCache(256)
+
+# 缩放倍率按对数分档（每档约4.4%），缩放动画中连续变化的倍率也能命中缓存
+_SCALE_STEPS_PER_OCTAVE = 16
 
 def scale_icon(icon, factor):
-    """缩放图标"""
+    """缩放图标（倍率分档后，同一图标同一尺寸只做一次smoothscale，返回的Surface不要原地修改）"""
     if icon is None:
         return None
+    if factor > 0:
+        factor = 2.0 ** (round(math.log2(factor) * _SCALE_STEPS_PER_OCTAVE) / _SCALE_STEPS_PER_OCTAVE)
     w, h = icon.get_size()
     new_w = max(1, int(w * factor))
     new_h = max(1, int(h * factor))
-    return pygame.transform.smoothscale(icon, (new_w, new_h))
+    key = (new_w, new_h)
+    scaled = _SCALED_ICON_CACHE.get(icon, key)
+    if scaled is None:
+        scaled = _SCALED_ICON_CACHE.put(icon, key, pygame.transform.smoothscale(icon, (new_w, new_h)))
+    return scaled
 
 class Station:
     """单个观测站点"""
@@ -39,11 +57,22 @@ class Station:
         # 闪烁效果触发记录（追踪已触发的震度等级）
         self.flash_triggered_levels = set()  # 已触发闪烁的震度等级集合，如 {'3', '4', '5-'}
 
+        # 震源相关的固定量 (震央距离, P波到达时刻, S波到达时刻, S波震度)
+        # 由 StationManager 按震源批量预计算；为 None 时在 update 中逐项计算
+        self.eq_terms = None
+
     def update(self, earthquake, current_time: float, dt: float):
         """更新站点状态 - 渐进式增长逻辑（Scratch兼容）"""
-        # 使用 earthquake 对象的方法计算正确的到达时间（基于震源距离）
-        p_arrival_time = earthquake.get_p_arrival_time(self.lat, self.lon)
-        s_arrival_time = earthquake.get_s_arrival_time(self.lat, self.lon)
+        terms = self.eq_terms
+        if terms is None:
+            dist = earthquake.get_epicentral_distance(self.lat, self.lon)
+            terms = (
+                dist,
+                earthquake.p_arrival_time_at(dist),
+                earthquake.s_arrival_time_at(dist),
+                calc_jma_intensity(earthquake.magnitude, earthquake.depth, dist),
+            )
+        epicentral_dist, p_arrival_time, s_arrival_time, s_intensity = terms
 
         # 检查波是否到达（记录首次P波到达时刻）
         was_p_arrived = self.p_wave_arrived
@@ -54,31 +83,16 @@ class Station:
         if self.p_wave_arrived and not was_p_arrived:
             self.p_arrival_time = current_time
             # 计算P波振幅（简化：基于震级和距离）
-            epicentral_dist = earthquake.get_epicentral_distance(self.lat, self.lon)
             # 振幅公式（简化版）: A = 10^(M-1.5) / D
             if epicentral_dist > 0:
                 self.p_amplitude = (10 ** (earthquake.magnitude - 1.5)) / max(1, epicentral_dist)
 
-        # 计算震央距离（用于震度计算）
-        epicentral_dist = earthquake.get_epicentral_distance(self.lat, self.lon)
-
         # 根据波的到达情况计算目标震度
         if self.s_wave_arrived:
-            # S波已到达，使用完整震度计算
-            from intensity import calc_jma_intensity
-            self.target_intensity = calc_jma_intensity(
-                earthquake.magnitude,
-                earthquake.depth,
-                epicentral_dist
-            )
+            # S波已到达，使用完整震度
+            self.target_intensity = s_intensity
         elif self.p_wave_arrived:
             # 只有P波到达，P波震度 = S波震度 / 1.5 - 0.5（Scratch公式）
-            from intensity import calc_jma_intensity
-            s_intensity = calc_jma_intensity(
-                earthquake.magnitude,
-                earthquake.depth,
-                epicentral_dist
-            )
             self.target_intensity = max(-3, s_intensity / 1.5 - 0.5)
         else:
             # 波未到达
@@ -245,6 +259,18 @@ class StationManager:
         self.stations: List[Station] = []
         self.load_stations(stations_file)
 
+        # P波到达调度：按预计P波到达时刻排序的小顶堆 [(到达时刻, 站点下标), ...]
+        # 波未到达的站点不参与逐帧更新，到时刻后才弹出加入活动列表
+        self._pending: List[Tuple[float, int]] = []
+        self._active: List[Station] = []
+        self._schedule_key = None  # (地震对象id, lat, lon, depth)，震源变化时重建
+        self._terms_key = None  # (调度键, 震级)，变化时重算各站点的 eq_terms
+        self._detected_count = 0  # 已检测到P波的站点数
+
+        # 视口内站点缓存：视图 (map_bounds) 不变时复用，变化时一次性批量投影并裁剪
+        self._screen_key = None
+        self._visible_stations: List[Tuple[Station, Tuple[int, int]]] = []
+
         # 预渲染字体
         self.font = pygame.font.Font(None, 16)
         self.small_font = pygame.font.Font(None, 14)
@@ -263,9 +289,13 @@ class StationManager:
         except FileNotFoundError:
             print(f"警告: 站点文件 {filename} 不存在")
             self.stations = []
+        # 站点平面坐标 (km)，批量计算震央距离用
+        self._st_x_km, self._st_y_km = latlons_to_xy_km(
+            [s.lat for s in self.stations], [s.lon for s in self.stations]
+        )
 
-    def reset(self):
-        """重置所有站点状态"""
+    def _reset_station_state(self):
+        """重置各站点的观测状态与已检测站点数（保留预计算的 eq_terms）"""
         for station in self.stations:
             station.intensity = -3
             station.target_intensity = -3
@@ -276,6 +306,43 @@ class StationManager:
             station.p_arrival_time = None  # 重置P波到达记录
             station.p_amplitude = 0
             station.flash_triggered_levels = set()  # 重置闪烁触发记录
+        self._detected_count = 0
+
+    def reset(self):
+        """重置所有站点状态"""
+        self._reset_station_state()
+        for station in self.stations:
+            station.eq_terms = None
+        self._pending = []
+        self._active = []
+        self._schedule_key = None
+        self._terms_key = None
+
+    def _precompute_terms(self, earthquake):
+        """批量计算各站点的震央距离、P/S波到达时刻与S波震度，写入 station.eq_terms
+
+        这些量只取决于震源位置、深度与震级，逐帧的 Station.update 直接复用
+        """
+        ex, ey = latlon_to_xy_km(earthquake.lat, earthquake.lon)
+        dist = np.hypot(self._st_x_km - ex, self._st_y_km - ey)
+        terms = zip(
+            dist.tolist(),
+            earthquake.p_arrival_time_at(dist).tolist(),
+            earthquake.s_arrival_time_at(dist).tolist(),
+            calc_jma_intensity_batch(earthquake.magnitude, earthquake.depth, dist).tolist(),
+        )
+        for station, station_terms in zip(self.stations, terms):
+            station.eq_terms = station_terms
+
+    def _schedule(self, earthquake):
+        """按预计P波到达时刻重建调度堆（新地震或震源参数变化时调用）"""
+        self._pending = [
+            (station.eq_terms[1], idx) for idx, station in enumerate(self.stations)
+        ]
+        heapq.heapify(self._pending)
+        self._active = []
+        # 震源变了，之前的到达记录/最大震度/闪烁记录都作废，全部站点重新等待波到达
+        self._reset_station_state()
 
     def update(self, earthquake, current_time: float, dt: float):
         """更新所有站点
@@ -302,7 +369,25 @@ class StationManager:
         # 收集需要闪烁的站点（首次达到某震度等级）
         flash_stations = []
 
-        for station in self.stations:
+        schedule_key = (id(earthquake), earthquake.lat, earthquake.lon, earthquake.depth)
+        terms_key = (schedule_key, earthquake.magnitude)
+        if terms_key != self._terms_key:
+            self._terms_key = terms_key
+            self._precompute_terms(earthquake)
+        if schedule_key != self._schedule_key:
+            self._schedule_key = schedule_key
+            self._schedule(earthquake)
+
+        # 弹出P波已到达的站点，加入活动列表
+        pending = self._pending
+        while pending and pending[0][0] <= current_time:
+            _, idx = heapq.heappop(pending)
+            station = self.stations[idx]
+            if station.p_arrival_time is None:
+                self._detected_count += 1
+            self._active.append(station)
+
+        for station in self._active:
             station.update(earthquake, current_time, dt)
 
             # 收集当前震度等级
@@ -343,34 +428,42 @@ class StationManager:
 
         rendered = 0
 
-        for station in self.stations:
-            # 转换经纬度到屏幕坐标
-            screen_x, screen_y = simulator.latlon_to_screen(
-                station.lat, station.lon
-            )
+        bounds = simulator.map_bounds
+        screen_key = (bounds["min_lon"], bounds["max_lon"], bounds["min_lat"], bounds["max_lat"], len(self.stations))
+        if screen_key != self._screen_key:
+            self._screen_key = screen_key
+            points = simulator.latlons_to_screen(
+                [s.lat for s in self.stations], [s.lon for s in self.stations]
+            ).tolist()
+            # 只保留屏幕范围内的站点
+            self._visible_stations = [
+                (station, (x, y)) for station, (x, y) in zip(self.stations, points)
+                if 0 <= x <= WINDOW_WIDTH and 0 <= y <= WINDOW_HEIGHT
+            ]
 
-            # 检查是否在屏幕范围内
-            if not (0 <= screen_x <= WINDOW_WIDTH and 0 <= screen_y <= WINDOW_HEIGHT):
-                continue
+        r = max(4.5, int(14 * dot_scale))
+        visible = self._visible_stations
 
+        for station, pos in visible:
             rendered += 1
-            pos = (int(screen_x), int(screen_y))
 
             # 第一层：始终绘制圆点，颜色随震度连续渐变（更大更圆）
-            r = max(4.5, int(14 * dot_scale))
             color = station.get_color()
             pygame.draw.circle(screen, color, pos, r)
 
-            # 第二层：震度>=0时显示SVG图标（包括震度0）
-            if station.intensity >= 0 and station_icons:
-                icon_idx = intensity_to_scale(station.intensity)
-                idx_map = {'0':0, '1':1, '2':2, '3':3, '4':4, '5-':5, '5+':6, '6-':7, '6+':8, '7':9}
-                idx = idx_map.get(icon_idx, 0)
+        # 第二层：震度>=0时显示SVG图标（包括震度0），图标索引一次性批量查表，
+        # 收集后在所有圆点之上一次 blits
+        if not station_icons or not visible:
+            return
+        intensities = np.fromiter((station.intensity for station, _ in visible), dtype=np.float64, count=len(visible))
+        shown = np.flatnonzero(intensities >= 0)
+        icon_blits = []
+        for i, idx in zip(shown.tolist(), intensity_to_scale_indices(intensities[shown]).tolist()):
+            if idx in station_icons:
+                icon = scale_icon(station_icons[idx], icon_scale)
+                icon_blits.append((icon, icon.get_rect(center=visible[i][1])))
 
-                if idx in station_icons:
-                    icon = scale_icon(station_icons[idx], icon_scale)
-                    rect = icon.get_rect(center=pos)
-                    screen.blit(icon, rect)
+        screen.blits(icon_blits, doreturn=False)
 
     def get_max_intensity_in_region(self, region_bounds: Tuple[float, float, float, float]) -> float:
         """获取区域内的最大震度"""
@@ -427,4 +520,4 @@ class StationManager:
 
     def get_detected_station_count(self) -> int:
         """获取已检测到P波的站点数量"""
-        return sum(1 for s in self.stations if s.p_arrival_time is not None)
+        return self._detected_count
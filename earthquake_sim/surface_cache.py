@@ -0,0 +1,29 @@
+"""按源对象缓存派生 Surface 的 LRU（文字渲染、图标着色/缩放、S波叠加层共用）"""
+
+from collections import OrderedDict
+
+class SurfaceCache:
+    """LRU缓存：键为 (id(源对象), 附加键)，条目保留源对象引用防止id被复用
+
+    取出时核对源对象是否为同一个；超过上限时淘汰最久未用的条目
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # (id(源对象), 附加键) -> (源对象, 值)
+
+    def get(self, src, key):
+        """查找 src 以 key 派生的值，未命中返回 None"""
+        full_key = (id(src), key)
+        entry = self._entries.get(full_key)
+        if entry is None or entry[0] is not src:
+            return None
+        self._entries.move_to_end(full_key)
+        return entry[1]
+
+    def put(self, src, key, value):
+        """存入 src 以 key 派生的值并返回该值"""
+        self._entries[(id(src), key)] = (src, value)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return value
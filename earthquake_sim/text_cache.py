@@ -0,0 +1,16 @@
+"""文字渲染缓存：主界面与EEW警报框共用的 font.render LRU 缓存"""
+
+from surface_cache import SurfaceCache
+
+_TEXT_CACHE = SurfaceCache(512)  # 字体 × (文本, 颜色) -> Surface
+
+def render_text(font, text, color):
+    """带LRU缓存的 font.render(text, True, color)（返回的Surface不要原地修改）
+
+    连续变化的数值应先按显示精度格式化成字符串再传入，缓存键才不会无限增长
+    """
+    key = (text, tuple(color))
+    surf = _TEXT_CACHE.get(font, key)
+    if surf is None:
+        surf = _TEXT_CACHE.put(font, key, font.render(text, True, color))
+    return surf